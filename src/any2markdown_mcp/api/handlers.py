@@ -4,8 +4,8 @@ API 处理器
 实现所有RESTful API端点的处理逻辑
 """
 
+import asyncio
 import time
-import psutil
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import uuid
@@ -177,6 +177,14 @@ async def handle_validate(request: Request) -> Response:
         return create_json_response(error_data, status_code)
 
 
+def _collect_resource_usage():
+    """采集CPU、内存和磁盘使用情况"""
+    # 仅状态查询需要，延迟导入以加快服务启动
+    import psutil
+    
+    return psutil.cpu_percent(interval=0.1), psutil.virtual_memory(), psutil.disk_usage('/')
+
+
 async def handle_status(request: Request) -> Response:
     """处理系统状态API"""
     start_time = time.time()
@@ -184,10 +192,8 @@ async def handle_status(request: Request) -> Response:
     log_api_request(request, request_id)
     
     try:
-        # 获取系统信息
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        # 获取系统信息（采样会短暂等待，放到线程中执行以免阻塞事件循环）
+        cpu_percent, memory, disk = await asyncio.to_thread(_collect_resource_usage)
         
         # 计算运行时间
         uptime = int(time.time() - _start_time)
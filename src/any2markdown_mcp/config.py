@@ -60,6 +60,7 @@ class Config(BaseSettings):
     marker_force_ocr: bool = Field(default=False, description="是否强制OCR")
     marker_default_languages: str = Field(default="en", description="Marker默认语言")
     marker_max_pages: int = Field(default=50, description="Marker最大页数限制")
+    marker_workers: int = Field(default=0, description="Marker转换进程数（0表示在服务进程内转换，每个进程各自加载一份模型）")
     
     # PDF处理配置
     pdf_default_languages: str = Field(default="en,zh-cn", description="PDF默认语言")
@@ -67,11 +68,15 @@ class Config(BaseSettings):
     pdf_skip_images: bool = Field(default=False, description="是否跳过PDF图片")
     pdf_force_ocr: bool = Field(default=False, description="是否强制OCR")
     pdf_max_pages: int = Field(default=1000, description="PDF最大页数限制")
+    pdf_deep_analyze: bool = Field(default=False, description="转换时是否执行完整的PDF结构分析（图片/表格/文本密度）")
+    pdf_max_image_pixels: int = Field(default=16_000_000, description="PDF图片最大像素数，超过时按比例缩小渲染")
     
     # Word处理配置
     word_preserve_formatting: bool = Field(default=True, description="是否保持Word格式")
     word_extract_images: bool = Field(default=False, description="是否提取Word图片")
     word_convert_equations: bool = Field(default=True, description="是否转换Word公式")
+    word_fast_parse: bool = Field(default=False, description="是否跳过python-docx对象模型，直接流式解析document.xml")
+    word_workers: int = Field(default=0, description="Word解析进程数（0表示在服务进程的线程中解析）")
     
     # Excel处理配置
     excel_max_rows: int = Field(default=10000, description="Excel最大行数限制")
@@ -79,6 +84,7 @@ class Config(BaseSettings):
     excel_max_rows_per_sheet: int = Field(default=10000, description="Excel每个工作表最大行数")
     excel_include_empty_cells: bool = Field(default=False, description="是否包含空单元格")
     excel_convert_formulas: bool = Field(default=True, description="是否转换公式")
+    excel_extract_charts: bool = Field(default=False, description="是否检测Excel图表（需完整加载工作簿）")
     
     # 图片处理配置
     image_max_size: int = Field(default=10 * 1024 * 1024, description="单个图片最大大小")
@@ -6,8 +6,11 @@
 """
 
 import asyncio
+import multiprocessing
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Optional, Dict, Any
 import warnings
@@ -23,6 +26,26 @@ warnings.filterwarnings("ignore", category=UserWarning)
 
 logger = structlog.get_logger(__name__)
 
+# 转换子进程中加载的marker模型（每个进程只加载一次）
+_worker_marker: Optional[Dict[str, Any]] = None
+
+
+def _init_marker_worker(model_cache_dir: str, device: Optional[str]) -> None:
+    """进程池初始化函数：在子进程中预加载marker模型"""
+    global _worker_marker
+    from marker.scripts.convert import process_single_pdf, create_model_dict
+    
+    os.environ["TORCH_HOME"] = model_cache_dir
+    _worker_marker = {
+        "models": create_model_dict(device=device),
+        "convert_func": process_single_pdf
+    }
+
+
+def _marker_convert_worker(pdf_path: str, kwargs: Dict[str, Any]) -> tuple:
+    """在子进程中使用预加载的模型转换PDF"""
+    return _worker_marker["convert_func"](pdf_path, _worker_marker["models"], **kwargs)
+
 
 class ModelManager:
     """模型管理器，负责加载和管理所有机器学习模型"""
@@ -38,6 +61,11 @@ class ModelManager:
         self._initialized = False
         self._initialization_lock = asyncio.Lock()
         
+        # 独立的marker转换进程池（marker_workers > 0 时启用，首次转换时创建）
+        self.marker_workers = int(config.get("marker_workers", 0) or 0)
+        self._marker_pool: Optional[ProcessPoolExecutor] = None
+        self._marker_semaphore = asyncio.Semaphore(max(self.marker_workers, 1))
+        
         # 设置模型下载相关的环境变量（确保进度显示）
         self._setup_model_env_vars()
         
@@ -224,8 +252,42 @@ class ModelManager:
         await self.initialize()
         return self.models["marker"]["models"]
     
+    def _get_marker_pool(self) -> ProcessPoolExecutor:
+        """获取marker转换进程池，每个子进程在初始化时加载一次模型"""
+        if self._marker_pool is None:
+            device = None if self.device == "auto" else self.device
+            self._marker_pool = ProcessPoolExecutor(
+                max_workers=self.marker_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_marker_worker,
+                initargs=(str(self.model_cache_dir), device)
+            )
+            logger.info("Marker process pool created", workers=self.marker_workers)
+        return self._marker_pool
+    
+    async def _convert_in_pool(self, pdf_path: str, kwargs: Dict[str, Any]) -> tuple:
+        """在独立进程中转换PDF，转换期间事件循环不受阻塞"""
+        # 提交数不超过进程数，避免任务在进程池队列中堆积
+        async with self._marker_semaphore:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(
+                    self._get_marker_pool(), _marker_convert_worker, pdf_path, kwargs
+                )
+            except BrokenProcessPool:
+                # 子进程异常退出后进程池不可再用，下次调用时重建
+                self._marker_pool = None
+                raise
+    
     async def convert_pdf_with_marker(self, pdf_path: str, **kwargs) -> tuple:
         """使用marker转换PDF"""
+        if self.marker_workers > 0:
+            try:
+                return await self._convert_in_pool(pdf_path, kwargs)
+            except Exception as e:
+                logger.error("PDF conversion failed", error=str(e), pdf_path=pdf_path)
+                raise
+        
         await self.initialize()
         
         try:
@@ -275,6 +337,11 @@ class ModelManager:
         if self.device == "cuda" and torch.cuda.is_available():
             torch.cuda.empty_cache()
         
+        # 关闭marker转换进程池
+        if self._marker_pool is not None:
+            self._marker_pool.shutdown(wait=False, cancel_futures=True)
+            self._marker_pool = None
+        
         # 清理模型引用
         self.models.clear()
         self._initialized = False
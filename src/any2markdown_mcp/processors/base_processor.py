@@ -7,7 +7,12 @@
 import asyncio
 import base64
 import hashlib
+import mmap
+import os
+import shutil
+import struct
 import tempfile
+import zipfile
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
@@ -216,6 +221,10 @@ class BaseProcessor(ABC):
         except Exception:
             return False
     
+    def content_digest(self, content: bytes) -> str:
+        """计算文件内容的哈希摘要，用于缓存键（blake2b比sha256更快）"""
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+    
     def validate_file_size(self, content: bytes, max_size: Optional[int] = None) -> None:
         """验证文件大小"""
         if max_size is None:
@@ -284,10 +293,9 @@ class BaseProcessor(ABC):
                        temp_dir=str(self.temp_image_dir),
                        temp_dir_exists=self.temp_image_dir.exists())
             
-            # 写入文件
+            # 写入文件（在线程中执行，多张图片可以并发保存）
             try:
-                with open(image_path, 'wb') as f:
-                    f.write(image_data)
+                await asyncio.to_thread(image_path.write_bytes, image_data)
                 
                 # 验证文件是否真正写入
                 if not image_path.exists():
@@ -338,6 +346,113 @@ class BaseProcessor(ABC):
             logger.debug("图片保存异常详情", traceback=traceback.format_exc())
             raise
     
+    async def save_image_from_zip(self, zip_file: zipfile.ZipFile, zinfo: zipfile.ZipInfo,
+                                  filename: str) -> Dict[str, Any]:
+        """
+        将ZIP包（docx/xlsx）中的图片条目直接流式写入临时目录
+        
+        未压缩（STORED）的条目直接从内存映射切片写出，或在支持时使用
+        os.sendfile在内核中拷贝；其余条目通过分块拷贝解压，避免整张图片
+        在内存中多次复制。
+        超过大小限制的图片仍走save_image的压缩流程。写入在线程中执行，
+        同一ZIP的多个条目可以并发保存。
+        
+        Args:
+            zip_file: 已打开的ZIP文件
+            zinfo: 图片条目信息
+            filename: 目标文件名
+            
+        Returns:
+            包含文件路径和URL的字典
+        """
+        if zinfo.file_size == 0:
+            raise ValueError("图片数据为空")
+        
+        if zinfo.file_size > self.image_max_size:
+            return await self.save_image(zip_file.read(zinfo), filename)
+        
+        filename = self._sanitize_filename(filename)
+        self.temp_image_dir.mkdir(parents=True, exist_ok=True)
+        image_path = self.temp_image_dir / filename
+        
+        try:
+            await asyncio.to_thread(self._write_zip_entry, zip_file, zinfo, image_path)
+            
+            # 验证文件大小
+            actual_size = image_path.stat().st_size
+            if actual_size != zinfo.file_size:
+                raise IOError(f"文件大小不匹配: 期望 {zinfo.file_size}, 实际 {actual_size}")
+            
+        except Exception as e:
+            logger.error("Failed to save image", 
+                        error=str(e),
+                        error_type=type(e).__name__,
+                        filename=filename,
+                        data_size=zinfo.file_size)
+            raise
+        
+        image_url = f"{self.server_base_url}/static/{filename}"
+        
+        logger.info("图片保存成功", 
+                   path=str(image_path), 
+                   url=image_url, 
+                   size=zinfo.file_size)
+        
+        return {
+            "filename": filename,
+            "path": str(image_path),
+            "url": image_url,
+            "size": zinfo.file_size
+        }
+    
+    def _write_zip_entry(self, zip_file: zipfile.ZipFile, zinfo: zipfile.ZipInfo, image_path: Path) -> None:
+        """将ZIP条目写入目标文件（阻塞操作，在线程中调用）"""
+        with open(image_path, 'wb') as dst:
+            if not self._copy_stored_zip_entry(zip_file, zinfo, dst):
+                with zip_file.open(zinfo, 'r') as src:
+                    shutil.copyfileobj(src, dst, length=1 << 20)
+    
+    def _copy_stored_zip_entry(self, zip_file: zipfile.ZipFile, zinfo: zipfile.ZipInfo, dst) -> bool:
+        """对未压缩且未加密的条目零拷贝写出（mmap切片或os.sendfile），不适用时返回False"""
+        if zinfo.compress_type != zipfile.ZIP_STORED or zinfo.flag_bits & 0x1:
+            return False
+        
+        fp = zip_file.fp
+        is_mmap = isinstance(fp, mmap.mmap)
+        if not is_mmap:
+            if not hasattr(os, "sendfile"):
+                return False
+            try:
+                src_fd = fp.fileno()
+            except (AttributeError, OSError, ValueError):
+                return False
+        
+        # 本地文件头长度为30字节，其后是文件名和扩展字段；
+        # 按绝对偏移读取，不移动共享的文件指针，便于并发保存
+        if is_mmap:
+            header = fp[zinfo.header_offset:zinfo.header_offset + 30]
+        else:
+            header = os.pread(src_fd, 30, zinfo.header_offset)
+        if len(header) != 30 or header[:4] != b"PK\x03\x04":
+            return False
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        offset = zinfo.header_offset + 30 + name_len + extra_len
+        
+        if is_mmap:
+            with memoryview(fp) as view:
+                with view[offset:offset + zinfo.file_size] as data:
+                    dst.write(data)
+            return True
+        
+        remaining = zinfo.file_size
+        while remaining > 0:
+            sent = os.sendfile(dst.fileno(), src_fd, offset, remaining)
+            if sent == 0:
+                raise IOError("sendfile提前结束")
+            offset += sent
+            remaining -= sent
+        return True
+    
     async def _compress_image(self, image_data: bytes) -> bytes:
         """压缩图片"""
         try:
@@ -9,15 +9,26 @@ Excel文档处理器
 """
 
 import asyncio
+import json
+import math
+import mmap
+import os
 import tempfile
+import threading
+import uuid
 import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 import re
 
+import aiofiles
 import structlog
 import pandas as pd
 import openpyxl
+from openpyxl import Workbook
 from openpyxl.chart import AreaChart, BarChart, LineChart, PieChart, ScatterChart
 import io
 
@@ -25,10 +36,53 @@ from .base_processor import BaseProcessor
 
 logger = structlog.get_logger(__name__)
 
+# 优先使用基于Rust的calamine引擎读取Excel，未安装时回退到pandas默认引擎
+try:
+    import python_calamine  # noqa: F401
+    _READ_EXCEL_ENGINE: Optional[str] = "calamine"
+except ImportError:
+    _READ_EXCEL_ENGINE = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+# 单元格内Markdown特殊字符的转义表（一次遍历完成全部替换）
+_MD_TRANSLATE = str.maketrans({"|": "\\|", "\n": " ", "\r": " "})
+
+# 可提取的图片扩展名
+_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff')
+
+
+class _MappedFile(mmap.mmap):
+    """只读内存映射文件，补充zipfile需要的seekable()"""
+    
+    def seekable(self) -> bool:
+        return True
+
+
+# 文件大小单位表，按 log2(size) // 10 查表
+_UNITS = ((1, "bytes"), (1024, "KB"), (1024 * 1024, "MB"), (1024 ** 3, "GB"))
+
 
 class ExcelProcessor(BaseProcessor):
     """Excel文档处理器"""
     
+    # 按内容哈希缓存的转换结果，所有实例共享
+    _CONVERSION_CACHE_MAXSIZE = 32
+    _conversion_cache: "OrderedDict[str, Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]]" = OrderedDict()
+    
+    # 实例按请求创建，并发上限和临时目录在所有实例间共享
+    _convert_sem = asyncio.Semaphore(os.cpu_count() or 1)
+    _temp_dir: Optional[tempfile.TemporaryDirectory] = None
+    
+    # 工作表转换线程池，所有实例共享，首次使用时创建
+    _SHEET_WORKERS = min(8, os.cpu_count() or 1)
+    _sheet_pool: Optional[ThreadPoolExecutor] = None
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         
@@ -36,6 +90,22 @@ class ExcelProcessor(BaseProcessor):
         self.max_rows_per_sheet = self._get_config_value("excel_max_rows_per_sheet", 10000)
         self.include_empty_cells = self._get_config_value("excel_include_empty_cells", False)
         self.convert_formulas = self._get_config_value("excel_convert_formulas", True)
+        self.extract_charts = self._get_config_value("excel_extract_charts", False)
+        self.enable_cache = self._get_config_value("enable_cache", True)
+        
+        # 安装pyarrow时单元格格式化在Arrow原生字符串内核中完成（读取仍使用NumPy类型，
+        # 混合类型的列无法整体转换为Arrow类型，格式化时逐列转换）
+        self.use_arrow = pa is not None
+        
+        # 图片文件名前缀（使用实例ID避免文件名冲突）
+        self._img_prefix = f"excel_{self.instance_id}_img_"
+        
+        # 常驻临时目录，避免每次转换都在公共目录中创建文件
+        if ExcelProcessor._temp_dir is None:
+            ExcelProcessor._temp_dir = tempfile.TemporaryDirectory(
+                prefix="any2markdown_excel_",
+                dir=self.temp_image_dir.parent
+            )
         
         logger.info("ExcelProcessor initialized")
     
@@ -54,45 +124,33 @@ class ExcelProcessor(BaseProcessor):
         Returns:
             转换结果
         """
-        temp_files = []
-        
         try:
             # 验证文件大小
             self.validate_file_size(file_content)
             
-            # 保存临时Excel文件
-            temp_excel_path = await self.save_temp_file(file_content, suffix=".xlsx")
-            temp_files.append(str(temp_excel_path))
-            
-            logger.info("Starting Excel conversion", 
-                       file_size=len(file_content),
-                       temp_path=str(temp_excel_path))
-            
-            # 分析Excel结构
-            excel_info = await self._analyze_excel_structure(temp_excel_path)
-            
-            # 提取图片（如果启用）
-            images_info = []
-            if options.get("extract_images", True):
-                images_info = await self._extract_images(temp_excel_path)
-                # 注意：不要将图片文件添加到temp_files中，因为它们需要被保留用于静态文件服务
-            
-            # 转换工作表
-            markdown_content = await self._convert_worksheets(temp_excel_path, excel_info, options)
-            
-            # 嵌入图片URL到markdown中（如果有图片）
-            if images_info:
-                # 对于Excel，需要处理每个工作表的内容
-                for sheet_data in markdown_content:
-                    sheet_data["content"] = await self._embed_image_urls(sheet_data["content"], images_info)
+            # 相同内容重复提交时直接复用缓存的转换结果
+            cache_key = self._make_cache_key(file_content, options) if self.enable_cache else None
+            cached = self._get_cached_conversion(cache_key) if cache_key else None
+            if cached:
+                logger.info("Excel conversion cache hit", file_size=len(file_content))
+                excel_info, images_info, markdown_content = cached
+            else:
+                async with self._convert_sem:
+                    excel_info, images_info, markdown_content = await self._convert_content(
+                        file_content, options
+                    )
+                if cache_key:
+                    self._store_cached_conversion(cache_key, excel_info, images_info, markdown_content)
             
             # 分页处理（按工作表分页）
             if options.get("paginate_output", True):
-                pages = await self._paginate_by_sheets(markdown_content, excel_info)
+                output = await self._paginate_by_sheets(markdown_content, excel_info)
+            elif len(markdown_content) == 1:
+                # 单工作表无需合并，直接输出其内容
+                output = markdown_content[0]["content"]
             else:
                 # 合并所有工作表内容
-                combined_content = "\n\n".join([sheet["content"] for sheet in markdown_content])
-                pages = [{"page": 1, "content": combined_content}]
+                output = "\n\n".join([sheet["content"] for sheet in markdown_content])
             
             # 构建元数据
             metadata = {
@@ -109,7 +167,7 @@ class ExcelProcessor(BaseProcessor):
             
             # 格式化输出
             result = self.format_output(
-                combined_content if not options.get("paginate_output", True) else pages,
+                output,
                 metadata,
                 options.get("output_format", "markdown")
             )
@@ -123,23 +181,142 @@ class ExcelProcessor(BaseProcessor):
         except Exception as e:
             logger.error("Excel conversion failed", error=str(e))
             raise
+    
+    async def _convert_content(self, file_content: bytes, options: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """分析结构、提取图片并转换工作表，返回(excel_info, images_info, worksheets_content)"""
+        temp_files = []
+        workbook = None
+        excel_file = None
+        
+        try:
+            # 保存临时Excel文件
+            temp_excel_path = await self._save_temp_workbook(file_content)
+            temp_files.append(str(temp_excel_path))
+            
+            logger.info("Starting Excel conversion", 
+                       file_size=len(file_content),
+                       temp_path=str(temp_excel_path))
+            
+            # 只打开一次工作簿，供结构分析和所有工作表转换共用
+            workbook = openpyxl.load_workbook(
+                str(temp_excel_path), read_only=True, data_only=True, keep_links=False
+            )
+            excel_file = pd.ExcelFile(str(temp_excel_path), engine=_READ_EXCEL_ENGINE)
+            
+            # 分析Excel结构（图片和图表只读取ZIP中央目录判断，不解压）
+            media_entries = self._peek_media(temp_excel_path)
+            excel_info = await self._analyze_excel_structure(workbook, media_entries)
+            
+            # 图表明细需要完整加载工作簿，仅在配置开启且存在图表部件时执行
+            if self.extract_charts and excel_info["has_charts"]:
+                await self._extract_charts(temp_excel_path)
+            
+            # 提取图片（如果启用）
+            images_info = []
+            if options.get("extract_images", True) and excel_info["has_images"]:
+                images_info = await self._extract_images(temp_excel_path)
+                # 注意：不要将图片文件添加到temp_files中，因为它们需要被保留用于静态文件服务
+            
+            # 转换工作表
+            markdown_content = await self._convert_worksheets(excel_file, excel_info, options)
+            
+            # 嵌入图片URL到markdown中（如果有图片）
+            if images_info:
+                # 对于Excel，需要处理每个工作表的内容
+                for sheet_data in markdown_content:
+                    sheet_data["content"] = await self._embed_image_urls(sheet_data["content"], images_info)
+            
+            return excel_info, images_info, markdown_content
+            
         finally:
+            # 关闭共享的工作簿句柄
+            if workbook is not None:
+                workbook.close()
+            if excel_file is not None:
+                excel_file.close()
+            
             # 清理临时文件
             if temp_files:
                 await self.cleanup_temp_files(temp_files)
     
-    async def _analyze_excel_structure(self, excel_path: Path) -> Dict[str, Any]:
-        """分析Excel文档结构"""
+    async def _save_temp_workbook(self, content: bytes) -> Path:
+        """异步写入临时Excel文件（位于共享的临时目录中）"""
+        temp_path = Path(self._temp_dir.name) / f"{uuid.uuid4().hex}.xlsx"
+        async with aiofiles.open(temp_path, 'wb') as f:
+            await f.write(content)
+        return temp_path
+    
+    def _make_cache_key(self, file_content: bytes, options: Dict[str, Any]) -> str:
+        """根据文件内容哈希和影响转换结果的选项生成缓存键"""
+        sheets = options.get("sheets")
+        if isinstance(sheets, str):
+            sheets = [sheets]
+        return "|".join((
+            self.content_digest(file_content),
+            json.dumps(sheets),
+            json.dumps(options.get("columns")),
+            str(bool(options.get("extract_images", True))),
+        ))
+    
+    def _get_cached_conversion(self, cache_key: str) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """读取缓存的转换结果，返回副本以免调用方修改缓存"""
+        cached = self._conversion_cache.get(cache_key)
+        if cached is None:
+            return None
+        
+        excel_info, images_info, worksheets_content = cached
+        
+        # 图片文件可能已被定期清理，此时缓存失效
+        if any(not Path(img["path"]).exists() for img in images_info):
+            self._conversion_cache.pop(cache_key, None)
+            return None
+        
+        self._conversion_cache.move_to_end(cache_key)
+        return (
+            excel_info,
+            [dict(img) for img in images_info],
+            [dict(sheet) for sheet in worksheets_content],
+        )
+    
+    def _store_cached_conversion(self, cache_key: str, excel_info: Dict[str, Any],
+                                 images_info: List[Dict[str, Any]],
+                                 worksheets_content: List[Dict[str, Any]]) -> None:
+        """写入转换结果缓存，超出容量时淘汰最久未使用的条目"""
+        self._conversion_cache[cache_key] = (
+            excel_info,
+            [dict(img) for img in images_info],
+            [dict(sheet) for sheet in worksheets_content],
+        )
+        self._conversion_cache.move_to_end(cache_key)
+        while len(self._conversion_cache) > self._CONVERSION_CACHE_MAXSIZE:
+            self._conversion_cache.popitem(last=False)
+    
+    def _peek_media(self, excel_path: Path) -> List[zipfile.ZipInfo]:
+        """只读取ZIP中央目录，列出图片和图表条目（不解压任何内容）"""
+        try:
+            with zipfile.ZipFile(str(excel_path), 'r') as excel_zip:
+                return [zinfo for zinfo in excel_zip.infolist()
+                        if zinfo.filename.startswith(('xl/media/', 'xl/charts/'))]
+        except Exception as e:
+            logger.warning("Failed to read Excel zip directory", error=str(e))
+            return []
+    
+    async def _analyze_excel_structure(self, workbook: Workbook, media_entries: List[zipfile.ZipInfo]) -> Dict[str, Any]:
+        """分析Excel文档结构（workbook需以只读模式打开）"""
         try:
-            # 使用openpyxl分析结构
-            workbook = openpyxl.load_workbook(str(excel_path), read_only=True)
-            
             info = {
                 "sheet_count": len(workbook.sheetnames),
                 "sheet_names": workbook.sheetnames,
                 "total_rows": 0,
                 "total_columns": 0,
-                "has_charts": False,
+                "has_images": any(
+                    zinfo.filename.startswith('xl/media/')
+                    and zinfo.filename.lower().endswith(_IMAGE_EXTENSIONS)
+                    for zinfo in media_entries
+                ),
+                "has_charts": any(
+                    zinfo.filename.startswith('xl/charts/chart') for zinfo in media_entries
+                ),
                 "has_formulas": False,
                 "sheet_info": {}
             }
@@ -148,12 +325,16 @@ class ExcelProcessor(BaseProcessor):
                 sheet = workbook[sheet_name]
                 
                 # 获取有效数据范围
-                if sheet.max_row and sheet.max_column:
-                    sheet_rows = sheet.max_row
-                    sheet_cols = sheet.max_column
-                else:
+                sheet_rows = sheet.max_row
+                sheet_cols = sheet.max_column
+                if sheet_rows is None or sheet_cols is None:
+                    # 部分写入工具不输出dimension标签，需逐行扫描统计
+                    sheet.reset_dimensions()
                     sheet_rows = 0
                     sheet_cols = 0
+                    for row in sheet.iter_rows(values_only=True):
+                        sheet_rows += 1
+                        sheet_cols = max(sheet_cols, len(row))
                 
                 info["total_rows"] += sheet_rows
                 info["total_columns"] = max(info["total_columns"], sheet_cols)
@@ -165,18 +346,6 @@ class ExcelProcessor(BaseProcessor):
                     "has_data": sheet_rows > 0 and sheet_cols > 0
                 }
             
-            workbook.close()
-            
-            # 使用pandas检查公式和图表
-            try:
-                with pd.ExcelFile(str(excel_path)) as excel_file:
-                    for sheet_name in excel_file.sheet_names:
-                        # 读取少量数据检查是否有公式
-                        df = pd.read_excel(excel_file, sheet_name=sheet_name, nrows=10)
-                        # 这里可以添加更详细的公式检测逻辑
-            except Exception as e:
-                logger.warning("Could not analyze Excel with pandas", error=str(e))
-            
             logger.debug("Excel structure analyzed", info=info)
             return info
             
@@ -184,8 +353,12 @@ class ExcelProcessor(BaseProcessor):
             logger.error("Failed to analyze Excel structure", error=str(e))
             raise
     
-    async def _convert_worksheets(self, excel_path: Path, excel_info: Dict[str, Any], options: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """转换所有工作表"""
+    async def _convert_worksheets(self, excel_file: pd.ExcelFile, excel_info: Dict[str, Any], options: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """转换所有工作表
+        
+        各工作表在共享线程池中转换；pd.read_excel共用同一ExcelFile句柄，
+        读取由read_lock串行执行，只有DataFrame到Markdown的格式化会并发进行。
+        """
         worksheets_content = []
         
         try:
@@ -196,27 +369,49 @@ class ExcelProcessor(BaseProcessor):
             if isinstance(target_sheets, str):
                 target_sheets = [target_sheets]
             
+            sheets_to_convert = []
+            empty_sheets = {}
             for sheet_name in target_sheets:
                 if sheet_name not in excel_info["sheet_names"]:
                     logger.warning("Sheet not found", sheet_name=sheet_name)
                     continue
                 
+                # 结构分析已确认为空的工作表无需再经pandas解析
+                if not excel_info["sheet_info"][sheet_name]["has_data"]:
+                    logger.debug("Skipping empty sheet", sheet_name=sheet_name)
+                    empty_sheets[sheet_name] = f"## {sheet_name}\n\n*This sheet is empty.*"
+                    continue
+                
                 logger.info("Converting sheet", sheet_name=sheet_name)
+                sheets_to_convert.append(sheet_name)
+            
+            # 共享的ExcelFile句柄不是线程安全的，读取时需要加锁
+            read_lock = threading.Lock()
+            results = await asyncio.gather(
+                *[self._convert_single_sheet(excel_file, sheet_name, options, read_lock)
+                  for sheet_name in sheets_to_convert],
+                return_exceptions=True
+            )
+            
+            converted = dict(zip(sheets_to_convert, results))
+            for sheet_name in target_sheets:
+                if sheet_name in empty_sheets:
+                    result = empty_sheets[sheet_name]
+                elif sheet_name in converted:
+                    result = converted[sheet_name]
+                else:
+                    continue
                 
-                try:
-                    # 转换单个工作表
-                    sheet_content = await self._convert_single_sheet(excel_path, sheet_name, options)
-                    
-                    worksheets_content.append({
-                        "sheet_name": sheet_name,
-                        "content": sheet_content
-                    })
-                    
-                except Exception as e:
+                if isinstance(result, Exception):
                     logger.error("Failed to convert sheet", 
-                               sheet_name=sheet_name, error=str(e))
+                               sheet_name=sheet_name, error=str(result))
                     # 继续处理其他工作表
                     continue
+                
+                worksheets_content.append({
+                    "sheet_name": sheet_name,
+                    "content": result
+                })
             
             return worksheets_content
             
@@ -224,31 +419,60 @@ class ExcelProcessor(BaseProcessor):
             logger.error("Failed to convert worksheets", error=str(e))
             raise
     
-    async def _convert_single_sheet(self, excel_path: Path, sheet_name: str, options: Dict[str, Any]) -> str:
-        """转换单个工作表"""
-        try:
-            # 读取Excel数据
-            df = pd.read_excel(
-                str(excel_path), 
-                sheet_name=sheet_name,
-                na_filter=not self.include_empty_cells,
-                keep_default_na=not self.include_empty_cells
+    @classmethod
+    def _get_sheet_pool(cls) -> ThreadPoolExecutor:
+        """获取工作表转换线程池（线程按需创建）"""
+        if cls._sheet_pool is None:
+            cls._sheet_pool = ThreadPoolExecutor(
+                max_workers=cls._SHEET_WORKERS,
+                thread_name_prefix="excel-sheet"
             )
+        return cls._sheet_pool
+    
+    async def _convert_single_sheet(self, excel_file: pd.ExcelFile, sheet_name: str, options: Dict[str, Any],
+                                    read_lock: Optional[threading.Lock] = None) -> str:
+        """转换单个工作表（在线程池中执行，避免阻塞事件循环）"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_sheet_pool(), self._convert_single_sheet_sync, excel_file, sheet_name, options, read_lock
+        )
+    
+    def _convert_single_sheet_sync(self, excel_file: pd.ExcelFile, sheet_name: str, options: Dict[str, Any],
+                                   read_lock: Optional[threading.Lock] = None) -> str:
+        """转换单个工作表（同步实现）"""
+        try:
+            # 所选列按各工作表的表头逐列匹配，缺少部分列的工作表只保留存在的列
+            columns = options.get("columns")
+            wanted = set(columns) if columns else None
+            
+            # 读取Excel数据（多读一行用于判断是否需要截断）
+            with read_lock or nullcontext():
+                df = pd.read_excel(
+                    excel_file, 
+                    sheet_name=sheet_name,
+                    nrows=self.max_rows_per_sheet + 1,
+                    usecols=(lambda col: col in wanted) if wanted else None,
+                    na_filter=not self.include_empty_cells,
+                    keep_default_na=not self.include_empty_cells
+                )
+            
+            # 工作表不含任何所选列时保留标题并注明，而不是当作空表
+            if wanted and len(df.columns) == 0:
+                return f"## {sheet_name}\n\n*None of the requested columns were found in this sheet.*"
             
             # 限制行数
             if len(df) > self.max_rows_per_sheet:
                 logger.warning("Sheet has too many rows, truncating", 
                              sheet_name=sheet_name,
-                             original_rows=len(df),
                              max_rows=self.max_rows_per_sheet)
                 df = df.head(self.max_rows_per_sheet)
             
-            # 处理空值
-            if not self.include_empty_cells:
+            # 处理空值（Arrow格式化时空值统一处理，无需预先填充）
+            if not self.include_empty_cells and not self.use_arrow:
                 df = df.fillna("")
             
             # 转换为Markdown表格
-            markdown_content = await self._dataframe_to_markdown(df, sheet_name, options)
+            markdown_content = self._dataframe_to_markdown(df, sheet_name, options)
             
             return markdown_content
             
@@ -257,19 +481,20 @@ class ExcelProcessor(BaseProcessor):
                        sheet_name=sheet_name, error=str(e))
             raise
     
-    async def _dataframe_to_markdown(self, df: pd.DataFrame, sheet_name: str, options: Dict[str, Any]) -> str:
+    def _dataframe_to_markdown(self, df: pd.DataFrame, sheet_name: str, options: Dict[str, Any]) -> str:
         """将DataFrame转换为Markdown"""
         try:
-            markdown_lines = []
+            buf = io.StringIO()
             
             # 添加工作表标题
-            markdown_lines.append(f"## {sheet_name}")
-            markdown_lines.append("")
+            buf.write("## ")
+            buf.write(sheet_name)
+            buf.write("\n\n")
             
             # 检查是否有数据
             if df.empty:
-                markdown_lines.append("*This sheet is empty.*")
-                return "\n".join(markdown_lines)
+                buf.write("*This sheet is empty.*")
+                return buf.getvalue()
             
             # 处理列名
             columns = []
@@ -280,42 +505,50 @@ class ExcelProcessor(BaseProcessor):
                 columns.append(col_name)
             
             # 创建表格头部
-            markdown_lines.append("| " + " | ".join(columns) + " |")
-            markdown_lines.append("| " + " | ".join(["---"] * len(columns)) + " |")
-            
-            # 添加数据行
-            for index, row in df.iterrows():
-                cells = []
-                for col in df.columns:
-                    cell_value = row[col]
-                    
-                    # 处理不同类型的值
-                    if pd.isna(cell_value):
-                        cell_str = ""
-                    elif isinstance(cell_value, (int, float)):
-                        if pd.isna(cell_value):
-                            cell_str = ""
-                        else:
-                            cell_str = str(cell_value)
-                    else:
-                        cell_str = str(cell_value).strip()
-                    
-                    # 转义Markdown特殊字符
-                    cell_str = cell_str.replace("|", "\\|").replace("\n", " ")
-                    cells.append(cell_str)
-                
-                markdown_lines.append("| " + " | ".join(cells) + " |")
+            buf.write("| " + " | ".join(columns) + " |\n")
+            buf.write("| " + " | ".join(["---"] * len(columns)) + " |\n")
+            
+            # 添加数据行（按列向量化处理，避免逐单元格的Python循环）
+            if self.use_arrow:
+                buf.write(self._format_rows_arrow(df))
+            else:
+                cells = df.astype(object).where(df.notna(), "").astype(str)
+                cells = cells.apply(lambda col: col.str.strip().str.translate(_MD_TRANSLATE))
+                columns_data = [cells.iloc[:, i] for i in range(cells.shape[1])]
+                rows = columns_data[0].str.cat(columns_data[1:], sep=" | ")
+                buf.write(("| " + rows + " |").str.cat(sep="\n"))
             
             # 添加统计信息
-            markdown_lines.append("")
-            markdown_lines.append(f"*Sheet contains {len(df)} rows and {len(df.columns)} columns.*")
+            buf.write(f"\n\n*Sheet contains {len(df)} rows and {len(df.columns)} columns.*")
             
-            return "\n".join(markdown_lines)
+            return buf.getvalue()
             
         except Exception as e:
             logger.error("Failed to convert DataFrame to markdown", error=str(e))
             raise
     
+    def _format_rows_arrow(self, df: pd.DataFrame) -> str:
+        """使用pyarrow计算内核生成表格数据行（逐列转换为Arrow字符串数组）"""
+        arrays = []
+        for _, col in df.items():
+            arr = None
+            if pd.api.types.is_string_dtype(col.dtype):
+                try:
+                    arr = pa.array(col, type=pa.string(), from_pandas=True)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    # 数值与文本混排的object列无法直接转换，按下方通用方式处理
+                    arr = None
+            if arr is None:
+                # 非字符串列沿用Python的文本表示（如 3.0、2024-01-01 00:00:00）
+                arr = pa.array(col.astype(object).where(col.notna(), "").astype(str), type=pa.string())
+            arr = pc.utf8_trim_whitespace(pc.fill_null(arr, ""))
+            for old, new in (("|", "\\|"), ("\n", " "), ("\r", " ")):
+                arr = pc.replace_substring(arr, old, new)
+            arrays.append(arr)
+        
+        rows = pc.binary_join_element_wise("| ", pc.binary_join_element_wise(*arrays, " | "), " |", "")
+        return "\n".join(rows.to_pylist())
+    
     async def _paginate_by_sheets(self, worksheets_content: List[Dict[str, Any]], excel_info: Dict[str, Any]) -> List[Dict[str, Any]]:
         """按工作表分页"""
         pages = []
@@ -331,10 +564,11 @@ class ExcelProcessor(BaseProcessor):
         return pages
     
     async def _extract_charts(self, excel_path: Path) -> List[Dict[str, Any]]:
-        """提取Excel图表（可选功能）"""
+        """提取Excel图表（可选功能，由excel_extract_charts控制）"""
         charts_info = []
         
         try:
+            # 只读模式不会解析图表，这里必须完整加载工作簿
             workbook = openpyxl.load_workbook(str(excel_path))
             
             for sheet_name in workbook.sheetnames:
@@ -394,47 +628,50 @@ class ExcelProcessor(BaseProcessor):
         images_info = []
         
         try:
-            # Excel文档也是一个ZIP文件
-            with zipfile.ZipFile(str(excel_path), 'r') as excel_zip:
+            # Excel文档也是一个ZIP文件；内存映射后解压直接读取页缓存，避免逐次read系统调用
+            with open(excel_path, 'rb') as excel_fp, \
+                    _MappedFile(excel_fp.fileno(), 0, access=mmap.ACCESS_READ) as excel_map, \
+                    zipfile.ZipFile(excel_map, 'r') as excel_zip:
                 # 查找图片文件
-                image_files = [f for f in excel_zip.namelist() 
-                             if f.startswith('xl/media/') and 
-                             any(f.lower().endswith(ext) for ext in 
-                                 ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff'])]
+                image_entries = [zinfo for zinfo in excel_zip.infolist()
+                                 if zinfo.filename.startswith('xl/media/') and 
+                                 zinfo.filename.lower().endswith(_IMAGE_EXTENSIONS)]
                 
-                logger.info("Found images in Excel", count=len(image_files))
+                logger.info("Found images in Excel", count=len(image_entries))
                 
-                for img_index, img_path in enumerate(image_files):
-                    try:
-                        # 读取图片数据
-                        img_data = excel_zip.read(img_path)
-                        
-                        # 获取原始文件名和扩展名
-                        original_filename = Path(img_path).name
-                        
-                        # 保存图片（使用实例ID避免文件名冲突）
-                        filename = f"excel_{self.instance_id}_img_{img_index + 1}_{original_filename}"
-                        image_info = await self.save_image(img_data, filename)
-                        
-                        # 添加额外信息
-                        image_info.update({
-                            "index": img_index + 1,
-                            "original_path": img_path,
-                            "original_filename": original_filename
-                        })
-                        
-                        images_info.append(image_info)
-                        
-                        logger.info("Image extracted from Excel", 
-                                   index=img_index + 1,
-                                   filename=filename,
-                                   size=len(img_data))
-                        
-                    except Exception as e:
+                # 先确定文件名，再并发保存所有图片
+                jobs = []
+                for img_index, zinfo in enumerate(image_entries):
+                    original_filename = zinfo.filename.rpartition("/")[2]
+                    filename = f"{self._img_prefix}{img_index + 1}_{original_filename}"
+                    jobs.append((img_index, zinfo, original_filename, filename))
+                
+                results = await asyncio.gather(
+                    *[self.save_image_from_zip(excel_zip, zinfo, filename)
+                      for _, zinfo, _, filename in jobs],
+                    return_exceptions=True
+                )
+                
+                for (img_index, zinfo, original_filename, filename), image_info in zip(jobs, results):
+                    if isinstance(image_info, Exception):
                         logger.warning("Failed to extract image from Excel", 
-                                     path=img_path,
-                                     error=str(e))
+                                     path=zinfo.filename,
+                                     error=str(image_info))
                         continue
+                    
+                    # 添加额外信息
+                    image_info.update({
+                        "index": img_index + 1,
+                        "original_path": zinfo.filename,
+                        "original_filename": original_filename
+                    })
+                    
+                    images_info.append(image_info)
+                    
+                    logger.info("Image extracted from Excel", 
+                               index=img_index + 1,
+                               filename=filename,
+                               size=image_info["size"])
             
             logger.info("Image extraction from Excel completed", count=len(images_info))
             return images_info
@@ -458,12 +695,8 @@ class ExcelProcessor(BaseProcessor):
                 size = img_info.get("size", 0)
                 
                 # 格式化文件大小
-                if size > 1024 * 1024:
-                    size_str = f"{size / (1024 * 1024):.1f} MB"
-                elif size > 1024:
-                    size_str = f"{size / 1024:.1f} KB"
-                else:
-                    size_str = f"{size} bytes"
+                div, unit = _UNITS[min(int(math.log2(max(size, 1)) // 10), len(_UNITS) - 1)]
+                size_str = f"{size / div:.1f} {unit}" if div > 1 else f"{size} bytes"
                 
                 image_section.append(f"### Image {i}: {filename}")
                 image_section.append(f"![{filename}]({url})")
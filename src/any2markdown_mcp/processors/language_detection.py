@@ -0,0 +1,272 @@
+"""
+文本语言检测
+
+为PDF转换的语言自动检测提供支持：
+- 单一非拉丁文字占主导时按码点统计直接判定
+- 其余情况使用langdetect（仅加载可映射语言的语料），未安装时回退到字符统计
+- 按文本样本摘要缓存检测结果
+"""
+
+import array
+import functools
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import structlog
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = structlog.get_logger(__name__)
+
+# 简单语言检测的码点区间（闭区间），各区间互不重叠
+_SCRIPT_RANGES = (
+    ('zh', 0x4E00, 0x9FFF),  # CJK统一汉字
+    ('zh', 0x3400, 0x4DBF),  # CJK扩展A
+    ('ja', 0x3040, 0x30FF),  # 平假名 + 片假名
+    ('ko', 0xAC00, 0xD7AF),  # 韩文音节
+    ('ko', 0x1100, 0x11FF),  # 韩文字母
+    ('ar', 0x0600, 0x06FF),  # 基本阿拉伯文
+    ('ar', 0x0750, 0x077F),  # 阿拉伯文补充
+    ('ru', 0x0400, 0x04FF),  # 西里尔字符
+    ('en', 0x0000, 0x00FF),  # 基本拉丁文 + 拉丁文补充
+)
+# 计数顺序决定同票时的优先级
+_DETECTION_LANGS = ('zh', 'ja', 'ko', 'ar', 'ru', 'en')
+
+
+def _build_script_lut() -> bytes:
+    """
+    构建基本多文种平面的码点查找表
+    
+    表项为语言在_DETECTION_LANGS中的下标，不属于任何语言的码点为len(_DETECTION_LANGS)。
+    0xFFFF为非字符，其余平面的码点查表时截断到该项，同样不计入任何语言。
+    """
+    lut = bytearray([len(_DETECTION_LANGS)]) * 0x10000
+    for lang, lo, hi in _SCRIPT_RANGES:
+        lut[lo:hi + 1] = bytes([_DETECTION_LANGS.index(lang)]) * (hi - lo + 1)
+    return bytes(lut)
+
+
+_SCRIPT_LUT = _build_script_lut()
+_SCRIPT_LUT_ARRAY = np.frombuffer(_SCRIPT_LUT, dtype=np.uint8) if np is not None else None
+
+# 无NumPy时以本机字节序的UTF-32编码配合array.array逐码点统计
+_UTF32_NATIVE = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+_UINT32_TYPECODE = 'I' if array.array('I').itemsize == 4 else 'L'
+
+# 单一非拉丁文字占非空白字符的比例超过该值时直接判定语言
+_DOMINANT_SCRIPT_RATIO = 0.6
+
+# 映射langdetect的语言代码到OCR支持的语言代码
+_LANGDETECT_MAPPING = {
+    'zh-cn': 'zh',
+    'zh': 'zh', 
+    'en': 'en',
+    'ja': 'ja',
+    'ko': 'ko',
+    'fr': 'fr',
+    'de': 'de',
+    'es': 'es',
+    'it': 'it',
+    'pt': 'pt',
+    'ru': 'ru',
+    'ar': 'ar',
+    'hi': 'hi',
+    'th': 'th',
+    'vi': 'vi'
+}
+
+_langdetect_ready = False
+_langdetect_lock = threading.Lock()
+
+# 语言检测结果缓存：以文本样本的摘要为键，重复上传同一文档时跳过检测
+_DETECTION_CACHE_MAXSIZE = 1024
+_detection_cache: "OrderedDict[bytes, List[str]]" = OrderedDict()
+_detection_cache_lock = threading.Lock()
+
+
+def _init_langdetect_profiles() -> None:
+    """
+    只加载可映射语言的langdetect语料
+    
+    langdetect首次检测时会加载全部55种语言的n-gram语料，而检测结果最终只映射到
+    _LANGDETECT_MAPPING中的语言。这里预先用这些语言的语料构建检测器工厂，
+    减少常驻内存和首次检测的加载时间。只在首次调用时执行一次，线程安全。
+    """
+    global _langdetect_ready
+    if _langdetect_ready:
+        return
+    
+    with _langdetect_lock:
+        if _langdetect_ready:
+            return
+        
+        from langdetect import detector_factory
+        
+        json_profiles = []
+        for lang in _LANGDETECT_MAPPING:
+            profile_path = os.path.join(detector_factory.PROFILES_DIRECTORY, lang)
+            if os.path.isfile(profile_path):
+                with open(profile_path, encoding='utf-8') as f:
+                    json_profiles.append(f.read())
+        
+        factory = detector_factory.DetectorFactory()
+        factory.load_json_profile(json_profiles)
+        detector_factory._factory = factory
+        _langdetect_ready = True
+        logger.info("langdetect语料已加载", profile_count=len(json_profiles))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_langdetect() -> Optional[Callable[[str], str]]:
+    """
+    延迟导入langdetect并加载语料，返回其detect函数；未安装时返回None
+    
+    只在首次需要统计检测时导入，不检测语言的进程不会加载该库。
+    """
+    try:
+        from langdetect import detect
+    except ImportError:
+        return None
+    
+    _init_langdetect_profiles()
+    return detect
+
+
+def detect_language_from_text(text: str) -> List[str]:
+    """
+    自动检测文本语言
+    
+    Args:
+        text: 要检测的文本
+        
+    Returns:
+        检测到的语言代码列表
+    """
+    if not text or len(text.strip()) < 10:
+        # 文本太短，返回默认语言
+        return ["en"]
+    
+    cache_key = hashlib.blake2b(text.encode('utf-8', 'ignore'), digest_size=8).digest()
+    with _detection_cache_lock:
+        cached = _detection_cache.get(cache_key)
+        if cached is not None:
+            _detection_cache.move_to_end(cache_key)
+            return list(cached)
+    
+    languages = _classify_language(text)
+    with _detection_cache_lock:
+        _detection_cache[cache_key] = list(languages)
+        while len(_detection_cache) > _DETECTION_CACHE_MAXSIZE:
+            _detection_cache.popitem(last=False)
+    return languages
+
+
+def _classify_language(text: str) -> List[str]:
+    """对文本样本执行语言检测（不经过缓存）"""
+    # 非拉丁文字占主导时字符统计即可确定语言，无需调用langdetect
+    dominant_lang = _dominant_script_language(text[:1000])
+    if dominant_lang:
+        logger.info("按文字类型检测到语言", detected_language=dominant_lang)
+        return [dominant_lang]
+    
+    try:
+        # 尝试使用langdetect库进行语言检测
+        detect = _get_langdetect()
+        if detect is None:
+            # 如果langdetect不可用，尝试使用简单的字符检测
+            logger.warning("langdetect库不可用，使用简单字符检测")
+            return _simple_language_detection(text)
+        
+        detected = detect(text)
+        mapped_lang = _LANGDETECT_MAPPING.get(detected, 'en')
+        logger.info("语言检测成功", detected_language=detected, mapped_language=mapped_lang)
+        return [mapped_lang]
+            
+    except Exception as e:
+        logger.warning("语言检测失败，使用默认语言", error=str(e))
+        return ["en"]
+
+
+def _dominant_script_language(sample: str) -> Optional[str]:
+    """
+    判断样本是否由单一非拉丁文字主导
+    
+    某种非拉丁文字超过非空白字符的60%时返回对应语言，否则返回None，
+    由langdetect区分拉丁语系语言。含假名的汉字文本交给langdetect判断是中文还是日文。
+    """
+    non_space = len("".join(sample.split()))
+    if not non_space:
+        return None
+    
+    char_counts = _count_scripts(sample)
+    threshold = non_space * _DOMINANT_SCRIPT_RATIO
+    for lang in _DETECTION_LANGS:
+        if lang == 'en' or char_counts[lang] <= threshold:
+            continue
+        if lang == 'zh' and char_counts['ja']:
+            return None
+        return lang
+    return None
+
+
+def _simple_language_detection(text: str) -> List[str]:
+    """
+    基于字符的简单语言检测
+    
+    Args:
+        text: 要检测的文本
+        
+    Returns:
+        检测到的语言代码列表
+    """
+    char_counts = _count_scripts(text[:1000])  # 只检查前1000个字符
+    
+    # 找出字符数最多的语言（同票时按_DETECTION_LANGS顺序取先出现者）
+    best_lang, best_count = "en", 0
+    for lang in _DETECTION_LANGS:
+        count = char_counts[lang]
+        if count > best_count:
+            best_lang, best_count = lang, count
+    
+    if best_count > 0:
+        logger.info("简单语言检测完成", detected_language=best_lang, char_count=best_count)
+        return [best_lang]
+    else:
+        return ["en"]  # 默认英文
+
+
+def _count_scripts(sample: str) -> Dict[str, int]:
+    """
+    按码点区间统计各语言字符数
+    
+    将文本按UTF-32编码为码点数组，通过查找表一次映射到语言下标后用bincount计数；
+    孤立代理项按其码点参与编码（surrogatepass），不计入任何语言。
+    """
+    if np is None:
+        return _count_scripts_scalar(sample)
+    
+    code_points = np.frombuffer(sample.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    lang_indexes = _SCRIPT_LUT_ARRAY.take(code_points, mode='clip')
+    counts = np.bincount(lang_indexes, minlength=len(_DETECTION_LANGS) + 1)
+    return dict(zip(_DETECTION_LANGS, counts.tolist()))
+
+
+def _count_scripts_scalar(sample: str) -> Dict[str, int]:
+    """逐码点查表统计各语言字符数（未安装NumPy时使用）"""
+    code_points = array.array(_UINT32_TYPECODE)
+    code_points.frombytes(sample.encode(_UTF32_NATIVE, 'surrogatepass'))
+    
+    # 最后一项收集不属于任何语言的码点
+    counts = [0] * (len(_DETECTION_LANGS) + 1)
+    lut = _SCRIPT_LUT
+    for code_point in code_points:
+        counts[lut[code_point] if code_point < 0x10000 else -1] += 1
+    return dict(zip(_DETECTION_LANGS, counts))
@@ -9,9 +9,16 @@ PDF文档处理器
 """
 
 import asyncio
+import gc
+import math
+import multiprocessing
+import os
 import tempfile
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 import re
 
 import structlog
@@ -20,13 +27,215 @@ from PIL import Image
 import io
 
 from .base_processor import BaseProcessor
+from .language_detection import detect_language_from_text
 
 logger = structlog.get_logger(__name__)
 
+# 小于该尺寸的图片视为装饰性图片
+_MIN_IMAGE_SIZE = 50
+
+# 浏览器可直接显示的原始编码，提取时不再转码
+_PASSTHROUGH_FORMATS = frozenset({"png", "jpeg", "jpg"})
+
+# 文本密度只需要字符数：不保留连字/空白格式，不排序，仍裁剪到页面范围内
+_DENSITY_TEXT_FLAGS = pymupdf.TEXT_MEDIABOX_CLIP
+
+# 语言自动检测的文本样本：最多取前3页，共500字符
+_LANGUAGE_SAMPLE_PAGES = 3
+_LANGUAGE_SAMPLE_CHARS = 500
+
+# 同时保存的图片数上限，避免耗尽文件描述符
+_IMAGE_SAVE_CONCURRENCY = 32
+
+# 图片提取时每处理多少页执行一次垃圾回收
+_GC_PAGE_INTERVAL = 50
+
+# 页面分隔标题（"## Page N" / "# Page N"）
+_PAGE_PATTERN = re.compile(r'^##?\s*Page\s+(\d+)')
+_PAGE_HEADER_RE = re.compile(r'Page (\d+)')
+
+
+def _sample_language_text(doc: pymupdf.Document) -> str:
+    """从文档前几页提取用于语言检测的纯文本样本（flags=0，不做额外的版面处理）"""
+    sample_text = ""
+    for page_num in range(min(_LANGUAGE_SAMPLE_PAGES, doc.page_count)):
+        sample_text += doc[page_num].get_text("text", flags=0)[:_LANGUAGE_SAMPLE_CHARS]
+        if len(sample_text) >= _LANGUAGE_SAMPLE_CHARS:
+            break
+    return sample_text
+
+
+def _xref_image_size(doc: pymupdf.Document, xref: int) -> Tuple[Optional[int], Optional[int]]:
+    """读取图片对象字典中的Width/Height（不解码图片），无法直接读取时返回(None, None)"""
+    width_type, width = doc.xref_get_key(xref, "Width")
+    height_type, height = doc.xref_get_key(xref, "Height")
+    if width_type != "int" or height_type != "int":
+        return None, None
+    return int(width), int(height)
+
+
+def _render_downscaled_image(page: pymupdf.Page, xref: int, width: int, height: int,
+                             max_pixels: int) -> Optional[bytes]:
+    """
+    按像素上限缩小渲染超大图片（不在原始分辨率下解码）
+    
+    通过渲染图片在页面上的区域实现缩放，MuPDF绘制时按目标分辨率解码；
+    找不到图片所在区域时返回None。
+    """
+    rects = page.get_image_rects(xref)
+    if not rects or rects[0].is_empty:
+        return None
+    
+    rect = rects[0]
+    scale = math.sqrt(max_pixels / (width * height))
+    zoom = width * scale / rect.width
+    pix = page.get_pixmap(clip=rect, matrix=pymupdf.Matrix(zoom, zoom))
+    try:
+        return pix.tobytes("png")
+    finally:
+        pix = None
+
+
+def _extract_page_images(pdf_path: str, page_numbers: List[int],
+                         max_pixels: int) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    在子进程中提取指定页面的图片
+    
+    PyMuPDF不支持多线程，因此按进程并行；每个进程自行打开文档，
+    只返回图片数据、格式和尺寸信息，图片保存仍由主进程完成。
+    
+    Returns:
+        (发现的图片总数, 图片数据列表)
+    """
+    images = []
+    image_count = 0
+    doc = pymupdf.open(pdf_path)
+    
+    try:
+        for pages_done, page_num in enumerate(page_numbers, 1):
+            page = doc[page_num]
+            page_images = page.get_images()
+            if page_images:
+                logger.info(f"在页面 {page_num + 1} 发现 {len(page_images)} 张图片")
+                image_count += len(page_images)
+            
+            for img_index, img in enumerate(page_images):
+                try:
+                    # 先从图片字典读取尺寸，过小的图片（可能是装饰性图片）无需解码
+                    xref = img[0]
+                    width, height = _xref_image_size(doc, xref)
+                    if width is not None and (width < _MIN_IMAGE_SIZE or height < _MIN_IMAGE_SIZE):
+                        continue
+                    
+                    # 超过像素上限的图片按比例缩小渲染，避免原始分辨率解码占用大量内存
+                    if width is not None and width * height > max_pixels:
+                        img_data = _render_downscaled_image(page, xref, width, height, max_pixels)
+                        if img_data:
+                            logger.warning("Image exceeds pixel limit, downscaled",
+                                         page=page_num + 1,
+                                         index=img_index + 1,
+                                         width=width,
+                                         height=height,
+                                         max_pixels=max_pixels)
+                            images.append({
+                                "page": page_num + 1,
+                                "index": img_index + 1,
+                                "data": img_data,
+                                "ext": "png",
+                                "width": width,
+                                "height": height
+                            })
+                            continue
+                    
+                    # 源图片本身为PNG/JPEG时直接使用原始编码，避免解码后重新压缩；
+                    # CMYK或带透明蒙版的图片仍走Pixmap转换
+                    img_dict = doc.extract_image(xref)
+                    if (img_dict and img_dict.get("ext") in _PASSTHROUGH_FORMATS
+                            and img_dict.get("colorspace", 0) < 4
+                            and not img_dict.get("smask")):
+                        if img_dict["width"] < _MIN_IMAGE_SIZE or img_dict["height"] < _MIN_IMAGE_SIZE:
+                            continue
+                        images.append({
+                            "page": page_num + 1,
+                            "index": img_index + 1,
+                            "data": img_dict["image"],
+                            "ext": img_dict["ext"],
+                            "width": img_dict["width"],
+                            "height": img_dict["height"]
+                        })
+                        continue
+                    
+                    # 获取图片数据（无论成功与否都及时释放Pixmap）
+                    pix = None
+                    pix_rgb = None
+                    try:
+                        pix = pymupdf.Pixmap(doc, xref)
+                        
+                        # 跳过过小的图片（字典中未直接给出尺寸时）
+                        if pix.width < _MIN_IMAGE_SIZE or pix.height < _MIN_IMAGE_SIZE:
+                            continue
+                        
+                        # 保存原始尺寸信息
+                        original_width = pix.width
+                        original_height = pix.height
+                        
+                        # 转换为PNG格式
+                        if pix.n - pix.alpha < 4:  # GRAY or RGB
+                            img_data = pix.tobytes("png")
+                        else:  # CMYK: 转换为RGB
+                            pix_rgb = pymupdf.Pixmap(pymupdf.csRGB, pix)
+                            img_data = pix_rgb.tobytes("png")
+                    finally:
+                        pix = None
+                        pix_rgb = None
+                    
+                    # 验证图片数据有效性
+                    if not img_data or len(img_data) == 0:
+                        logger.warning("Empty image data", 
+                                     page=page_num + 1, 
+                                     index=img_index + 1)
+                        continue
+                    
+                    images.append({
+                        "page": page_num + 1,
+                        "index": img_index + 1,
+                        "data": img_data,
+                        "ext": "png",
+                        "width": original_width,
+                        "height": original_height
+                    })
+                    
+                except Exception as e:
+                    logger.error("图片提取失败", 
+                               page=page_num + 1, 
+                               index=img_index + 1,
+                               error=str(e),
+                               error_type=type(e).__name__)
+                    continue
+            
+            # MuPDF会在内部缓存中保留已解码的图片，每页处理完后清空，
+            # 使常驻工作进程的内存占用不随文档页数增长
+            page = None
+            pymupdf.TOOLS.store_shrink(100)
+            if pages_done % _GC_PAGE_INTERVAL == 0:
+                gc.collect()
+    finally:
+        doc.close()
+    
+    return image_count, images
+
 
 class PDFProcessor(BaseProcessor):
     """PDF文档处理器"""
     
+    # 图片提取进程池，所有实例共享，首次使用时创建
+    _IMAGE_WORKERS = os.cpu_count() or 1
+    _image_pool: Optional[ProcessPoolExecutor] = None
+    
+    # 按内容哈希缓存的结构分析结果，所有实例共享
+    _ANALYSIS_CACHE_MAXSIZE = 128
+    _analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    
     def __init__(self, config: Dict[str, Any], model_manager=None):
         super().__init__(config)
         self.model_manager = model_manager
@@ -34,9 +243,23 @@ class PDFProcessor(BaseProcessor):
         # PDF特定配置
         self.pdf_dpi = self._get_config_value("pdf_dpi", 150)
         self.pdf_max_pages = self._get_config_value("pdf_max_pages", 500)
+        self.pdf_max_image_pixels = self._get_config_value("pdf_max_image_pixels", 16_000_000)
+        self.pdf_deep_analyze = self._get_config_value("pdf_deep_analyze", False)
+        self.header_footer_min_pages = self._get_config_value("header_footer_min_pages", 3)
+        self.enable_cache = self._get_config_value("enable_cache", True)
         
         logger.info("PDFProcessor initialized")
     
+    @classmethod
+    def _get_image_pool(cls) -> ProcessPoolExecutor:
+        """获取图片提取进程池（使用spawn，避免在多线程的服务进程中fork）"""
+        if cls._image_pool is None:
+            cls._image_pool = ProcessPoolExecutor(
+                max_workers=cls._IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return cls._image_pool
+    
     def get_supported_formats(self) -> List[str]:
         """获取支持的文件格式"""
         return ["pdf"]
@@ -58,16 +281,39 @@ class PDFProcessor(BaseProcessor):
             # 验证文件大小
             self.validate_file_size(file_content)
             
-            # 保存临时PDF文件
-            temp_pdf_path = await self.save_temp_file(file_content, suffix=".pdf")
-            temp_files.append(str(temp_pdf_path))
+            # PyMuPDF直接从内存打开文档；只有图片提取子进程和marker需要文件路径，
+            # 仅在这两种情况下写入临时PDF文件
+            temp_pdf_path = None
+            if options.get("extract_images", True) or self.model_manager:
+                temp_pdf_path = await self.save_temp_file(file_content, suffix=".pdf")
+                temp_files.append(str(temp_pdf_path))
             
             logger.info("Starting PDF conversion", 
                        file_size=len(file_content),
-                       temp_path=str(temp_pdf_path))
+                       temp_path=str(temp_pdf_path) if temp_pdf_path else None)
+            
+            # 未指定语言且要求自动检测时，在结构分析打开文档时顺带提取文本样本
+            detect_language = options.get("auto_detect_language", False) and not options.get("languages")
+            
+            # 分析PDF结构（相同内容重复提交时复用缓存的分析结果）；
+            # 转换流程只依赖页数，完整分析由pdf_deep_analyze开启
+            analyze_mode = "deep" if self.pdf_deep_analyze else "minimal"
+            cache_key = f"{self.content_digest(file_content)}:{analyze_mode}" if self.enable_cache else None
+            pdf_info = self._get_cached_analysis(cache_key) if cache_key else None
+            if pdf_info is None:
+                if self.pdf_deep_analyze:
+                    pdf_info = await self._analyze_pdf_structure(file_content, sample_text=detect_language)
+                else:
+                    pdf_info = await self._analyze_pdf_minimal(file_content, sample_text=detect_language)
+                if cache_key:
+                    self._store_cached_analysis(cache_key, pdf_info)
+            else:
+                logger.info("PDF analysis cache hit", file_size=len(file_content))
             
-            # 分析PDF结构
-            pdf_info = await self._analyze_pdf_structure(temp_pdf_path)
+            # 检测结果随元数据返回，不修改调用方传入的选项
+            detected_languages = None
+            if detect_language:
+                detected_languages = await self._detect_languages(file_content, pdf_info, cache_key)
             
             # 检查页面范围
             start_page = options.get("start_page", 0)
@@ -85,7 +331,7 @@ class PDFProcessor(BaseProcessor):
             
             # 使用marker转换PDF
             markdown_content, conversion_metadata = await self._convert_with_marker(
-                temp_pdf_path, options
+                temp_pdf_path, file_content, options
             )
             
             # 移除页眉页脚（如果启用）
@@ -113,8 +359,11 @@ class PDFProcessor(BaseProcessor):
                 "conversion_time": conversion_metadata.get("conversion_time", 0),
                 "model_info": conversion_metadata.get("model_info", {}),
                 "file_size": len(file_content),
-                "options_used": options
+                # 自动检测开关只控制处理流程，不随options_used回显
+                "options_used": {k: v for k, v in options.items() if k != "auto_detect_language"}
             }
+            if detected_languages is not None:
+                metadata["detected_languages"] = detected_languages
             
             # 格式化输出
             result = self.format_output(
@@ -137,10 +386,79 @@ class PDFProcessor(BaseProcessor):
             if temp_files:
                 await self.cleanup_temp_files(temp_files)
     
-    async def _analyze_pdf_structure(self, pdf_path: Path) -> Dict[str, Any]:
-        """分析PDF文档结构"""
+    def _get_cached_analysis(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存的结构分析结果，返回副本以免调用方修改缓存"""
+        cached = self._analysis_cache.get(cache_key)
+        if cached is None:
+            return None
+        
+        self._analysis_cache.move_to_end(cache_key)
+        return dict(cached)
+    
+    def _store_cached_analysis(self, cache_key: str, pdf_info: Dict[str, Any]) -> None:
+        """写入结构分析缓存，超出容量时淘汰最久未使用的条目"""
+        self._analysis_cache[cache_key] = dict(pdf_info)
+        self._analysis_cache.move_to_end(cache_key)
+        while len(self._analysis_cache) > self._ANALYSIS_CACHE_MAXSIZE:
+            self._analysis_cache.popitem(last=False)
+    
+    def _open_doc(self, source: Union[bytes, Path, str]) -> pymupdf.Document:
+        """打开PDF文档：字节内容直接从内存打开，否则按路径打开"""
+        if isinstance(source, (bytes, bytearray)):
+            return pymupdf.open(stream=source, filetype="pdf")
+        return pymupdf.open(str(source))
+    
+    async def _detect_languages(self, file_content: bytes, pdf_info: Dict[str, Any],
+                                cache_key: Optional[str]) -> List[str]:
+        """根据结构分析阶段提取的文本样本检测文档语言，失败时返回默认语言"""
+        try:
+            sample_text = pdf_info.get("text_sample")
+            if sample_text is None:
+                # 命中的缓存来自未要求检测的请求，补充提取样本并回写缓存
+                doc = self._open_doc(file_content)
+                try:
+                    sample_text = _sample_language_text(doc)
+                finally:
+                    doc.close()
+                pdf_info["text_sample"] = sample_text
+                if cache_key:
+                    self._store_cached_analysis(cache_key, pdf_info)
+            
+            languages = await asyncio.to_thread(detect_language_from_text, sample_text)
+            logger.info("Languages auto-detected", languages=languages)
+            return languages
+            
+        except Exception as e:
+            logger.warning("Language auto-detection failed, using default", error=str(e))
+            return ["en"]
+    
+    async def _analyze_pdf_minimal(self, source: Union[bytes, Path],
+                                   sample_text: bool = False) -> Dict[str, Any]:
+        """只读取页数和文档元数据（不解析页面内容；sample_text为True时额外提取语言检测样本）"""
+        try:
+            doc = self._open_doc(source)
+            try:
+                info = {
+                    "page_count": doc.page_count,
+                    "metadata": doc.metadata
+                }
+                if sample_text:
+                    info["text_sample"] = _sample_language_text(doc)
+            finally:
+                doc.close()
+            
+            logger.debug("PDF page count read", page_count=info["page_count"])
+            return info
+            
+        except Exception as e:
+            logger.error("Failed to analyze PDF structure", error=str(e))
+            raise
+    
+    async def _analyze_pdf_structure(self, source: Union[bytes, Path],
+                                     sample_text: bool = False) -> Dict[str, Any]:
+        """分析PDF文档结构（source可以是PDF内容或文件路径；sample_text为True时额外提取语言检测样本）"""
         try:
-            doc = pymupdf.open(str(pdf_path))
+            doc = self._open_doc(source)
             
             info = {
                 "page_count": len(doc),
@@ -162,7 +480,7 @@ class PDFProcessor(BaseProcessor):
                 })
                 
                 # 文本密度
-                text = page.get_text()
+                text = page.get_text("text", sort=False, flags=_DENSITY_TEXT_FLAGS)
                 info["text_density"].append(len(text.strip()))
                 
                 # 检查是否有图片
@@ -186,6 +504,9 @@ class PDFProcessor(BaseProcessor):
                         logger.debug("Table detection failed", error=str(e))
                         info["has_tables"] = False
             
+            if sample_text:
+                info["text_sample"] = _sample_language_text(doc)
+            
             doc.close()
             
             logger.debug("PDF structure analyzed", info=info)
@@ -196,102 +517,43 @@ class PDFProcessor(BaseProcessor):
             raise
     
     async def _extract_images(self, pdf_path: Path, start_page: int, end_page: int) -> List[Dict[str, Any]]:
-        """从PDF中提取图片"""
-        images_info = []
+        """从PDF中提取图片（各页面分片在进程池中并行解码）"""
         logger.info("开始从PDF中提取图片", path=str(pdf_path), page_range=f"{start_page}-{end_page}")
         
         try:
-            doc = pymupdf.open(str(pdf_path))
-            image_count = 0
-            
-            for page_num in range(start_page, min(end_page, len(doc))):
-                page = doc[page_num]
-                page_images = page.get_images()
-                if page_images:
-                    logger.info(f"在页面 {page_num + 1} 发现 {len(page_images)} 张图片")
-                    image_count += len(page_images)
-
-                for img_index, img in enumerate(page_images):
-                    try:
-                        # 获取图片数据
-                        xref = img[0]
-                        pix = pymupdf.Pixmap(doc, xref)
-                        
-                        # 跳过过小的图片（可能是装饰性图片）
-                        if pix.width < 50 or pix.height < 50:
-                            pix = None
-                            continue
-                        
-                        # 保存原始尺寸信息
-                        original_width = pix.width
-                        original_height = pix.height
-                        
-                        # 转换为PNG格式
-                        if pix.n - pix.alpha < 4:  # GRAY or RGB
-                            img_data = pix.tobytes("png")
-                        else:  # CMYK: 转换为RGB
-                            pix_rgb = pymupdf.Pixmap(pymupdf.csRGB, pix)
-                            img_data = pix_rgb.tobytes("png")
-                            pix_rgb = None
-                        
-                        pix = None
-                        
-                        # 验证图片数据有效性
-                        if not img_data or len(img_data) == 0:
-                            logger.warning("Empty image data", 
-                                         page=page_num + 1, 
-                                         index=img_index + 1)
-                            continue
-                        
-                        # 保存图片（使用实例ID避免文件名冲突）
-                        filename = f"pdf_{self.instance_id}_page_{page_num + 1}_img_{img_index + 1}.png"
-                        
-                        logger.info("准备保存图片", 
-                                  filename=filename, 
-                                  data_size=len(img_data),
-                                  page=page_num + 1,
-                                  index=img_index + 1)
-                        
-                        image_info = await self.save_image(img_data, filename)
-                        
-                        # 验证图片是否真正保存成功
-                        saved_path = Path(image_info["path"])
-                        if not saved_path.exists():
-                            logger.error("图片保存失败：文件不存在", 
-                                       path=str(saved_path),
-                                       filename=filename)
-                            continue
-                        
-                        # 添加页面和位置信息
-                        image_info.update({
-                            "page": page_num + 1,
-                            "index": img_index + 1,
-                            "original_size": {
-                                "width": original_width,
-                                "height": original_height
-                            }
-                        })
-                        
-                        images_info.append(image_info)
-                        
-                        logger.info("图片提取并保存成功", 
-                                  page=page_num + 1, 
-                                  index=img_index + 1,
-                                  filename=filename,
-                                  saved_path=str(saved_path),
-                                  file_exists=saved_path.exists())
-                        
-                    except Exception as e:
-                        logger.error("图片提取失败", 
-                                   page=page_num + 1, 
-                                   index=img_index + 1,
-                                   error=str(e),
-                                   error_type=type(e).__name__)
-                        import traceback
-                        logger.debug("图片提取异常详情", traceback=traceback.format_exc())
-                        continue
+            page_numbers = list(range(start_page, end_page))
+            if not page_numbers:
+                return []
+            
+            # 按工作进程数交错分片，图片集中的页面段也能均匀分摊
+            pool = self._get_image_pool()
+            shard_count = min(self._IMAGE_WORKERS, len(page_numbers))
+            shards = [page_numbers[i::shard_count] for i in range(shard_count)]
+            
+            loop = asyncio.get_running_loop()
+            try:
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(pool, _extract_page_images, str(pdf_path), shard,
+                                         self.pdf_max_image_pixels)
+                    for shard in shards
+                ])
+            except BrokenProcessPool:
+                # 子进程异常退出后进程池不可再用，下次调用时重建
+                PDFProcessor._image_pool = None
+                raise
+            
+            image_count = sum(count for count, _ in results)
+            extracted = sorted(
+                (image for _, shard_images in results for image in shard_images),
+                key=lambda image: (image["page"], image["index"])
+            )
             
-            doc.close()
+            # 并发保存所有图片，信号量限制同时打开的文件数
+            save_semaphore = asyncio.Semaphore(_IMAGE_SAVE_CONCURRENCY)
+            saved = await asyncio.gather(
+                *[self._save_extracted_image(image, save_semaphore) for image in extracted]
+            )
+            images_info = [image_info for image_info in saved if image_info is not None]
             
             logger.info("图片提取完成", total_found=image_count, total_saved=len(images_info))
             return images_info
@@ -300,7 +562,61 @@ class PDFProcessor(BaseProcessor):
             logger.error("从PDF提取图片时出错", error=str(e))
             return []
     
-    async def _convert_with_marker(self, pdf_path: Path, options: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    async def _save_extracted_image(self, image: Dict[str, Any],
+                                    semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+        """保存单张提取出的图片，失败时返回None"""
+        page_num = image["page"]
+        img_index = image["index"]
+        try:
+            # 保存图片（使用实例ID避免文件名冲突）
+            filename = f"pdf_{self.instance_id}_page_{page_num}_img_{img_index}.{image['ext']}"
+            
+            logger.info("准备保存图片", 
+                      filename=filename, 
+                      data_size=len(image["data"]),
+                      page=page_num,
+                      index=img_index)
+            
+            async with semaphore:
+                image_info = await self.save_image(image["data"], filename)
+            
+            # 验证图片是否真正保存成功
+            saved_path = Path(image_info["path"])
+            if not saved_path.exists():
+                logger.error("图片保存失败：文件不存在", 
+                           path=str(saved_path),
+                           filename=filename)
+                return None
+            
+            # 添加页面和位置信息
+            image_info.update({
+                "page": page_num,
+                "index": img_index,
+                "original_size": {
+                    "width": image["width"],
+                    "height": image["height"]
+                }
+            })
+            
+            logger.info("图片提取并保存成功", 
+                      page=page_num, 
+                      index=img_index,
+                      filename=filename,
+                      saved_path=str(saved_path),
+                      file_exists=saved_path.exists())
+            
+            return image_info
+            
+        except Exception as e:
+            logger.error("图片保存失败", 
+                       page=page_num, 
+                       index=img_index,
+                       error=str(e),
+                       error_type=type(e).__name__)
+            return None
+    
+    async def _convert_with_marker(self, pdf_path: Optional[Path], file_content: bytes,
+                                   options: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """使用marker转换PDF"""
         try:
             if not self.model_manager:
@@ -338,15 +654,15 @@ class PDFProcessor(BaseProcessor):
         except Exception as e:
             logger.error("Marker conversion failed", error=str(e))
             # 如果marker转换失败，尝试使用PyMuPDF作为备选
-            return await self._fallback_conversion(pdf_path, options)
+            return await self._fallback_conversion(file_content, options)
     
-    async def _fallback_conversion(self, pdf_path: Path, options: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    async def _fallback_conversion(self, source: Union[bytes, Path], options: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """备选转换方法（使用PyMuPDF）"""
         try:
             logger.info("Using fallback conversion method")
             
-            doc = pymupdf.open(str(pdf_path))
-            markdown_content = ""
+            doc = self._open_doc(source)
+            parts = []
             
             start_page = options.get("start_page", 0)
             end_page = options.get("end_page")
@@ -361,9 +677,10 @@ class PDFProcessor(BaseProcessor):
                 
                 # 简单的markdown格式化
                 if text.strip():
-                    markdown_content += f"\n\n## Page {page_num + 1}\n\n{text}\n"
+                    parts.append(f"\n\n## Page {page_num + 1}\n\n{text}\n")
             
             doc.close()
+            markdown_content = "".join(parts)
             
             metadata = {
                 "conversion_method": "pymupdf_fallback",
@@ -393,34 +710,31 @@ class PDFProcessor(BaseProcessor):
     
     async def _remove_pdf_specific_headers_footers(self, content: str, pdf_info: Dict[str, Any]) -> str:
         """移除PDF特定的页眉页脚"""
+        # 页数过少时无法区分页眉页脚与正常的重复内容，直接跳过
+        page_count = pdf_info.get("page_count", 1)
+        if page_count < self.header_footer_min_pages:
+            logger.debug("Skipping repeated-line detection for short PDF", page_count=page_count)
+            return content
+        
         lines = content.split('\n')
-        cleaned_lines = []
+        stripped_lines = [line.strip() for line in lines]
         
         # 检测重复出现的行（可能是页眉页脚）
-        line_counts = {}
-        for line in lines:
-            line = line.strip()
-            if line:
-                line_counts[line] = line_counts.get(line, 0) + 1
+        line_counts = Counter(line for line in stripped_lines if line)
         
         # 如果某行出现次数接近页面数，可能是页眉页脚
-        page_count = pdf_info.get("page_count", 1)
         threshold = max(2, page_count // 3)  # 至少出现页面数的1/3次
         
-        repeated_lines = {line for line, count in line_counts.items() 
-                         if count >= threshold and len(line) < 100}
+        repeated_lines = frozenset(line for line, count in line_counts.items() 
+                                   if count >= threshold and len(line) < 100)
+        if not repeated_lines:
+            return content
         
-        for line in lines:
-            line_stripped = line.strip()
-            
-            # 跳过重复的可能页眉页脚行
-            if line_stripped in repeated_lines:
-                logger.debug("Removing repeated line (likely header/footer)", line=line_stripped)
-                continue
-            
-            cleaned_lines.append(line)
+        logger.debug("Removing repeated lines (likely header/footer)", count=len(repeated_lines))
         
-        return '\n'.join(cleaned_lines)
+        # 跳过重复的可能页眉页脚行
+        return '\n'.join(line for line, line_stripped in zip(lines, stripped_lines)
+                         if line_stripped not in repeated_lines)
     
     async def _embed_image_urls(self, content: str, images_info: List[Dict[str, Any]]) -> str:
         """将图片URL嵌入到markdown内容中"""
@@ -430,74 +744,66 @@ class PDFProcessor(BaseProcessor):
         logger.info("Embedding image URLs in markdown", count=len(images_info))
         
         # 按页面分组图片
-        images_by_page = {}
+        images_by_page = defaultdict(list)
         for img in images_info:
-            page = img.get("page", 1)
-            if page not in images_by_page:
-                images_by_page[page] = []
-            images_by_page[page].append(img)
+            images_by_page[img.get("page", 1)].append(img)
+        
+        # 预先渲染每页的图片块
+        image_blocks = {page: self._render_page_images(page, imgs)
+                        for page, imgs in images_by_page.items()}
         
-        # 在每页内容后添加图片
+        # 单次扫描定位插入点：每页在非空行之后的第一个空行处插入该页图片，
+        # 其余内容按切片整体拼接
         lines = content.split('\n')
-        result_lines = []
+        pieces = []
+        start = 0
         current_page = 1
+        prev_blank = True
         
-        for line in lines:
-            result_lines.append(line)
-            
+        for i, line in enumerate(lines):
             # 检测页面分隔符
-            if line.startswith('## Page ') or line.startswith('# Page '):
-                try:
-                    page_match = re.search(r'Page (\d+)', line)
-                    if page_match:
-                        current_page = int(page_match.group(1))
-                except:
-                    pass
-            
-            # 在页面结束时添加图片
-            if (line.strip() == '' and 
-                current_page in images_by_page and 
-                len(result_lines) > 1 and 
-                result_lines[-2].strip() != ''):
-                
-                result_lines.append('')  # 空行分隔
-                result_lines.append(f'### Images from Page {current_page}')
-                result_lines.append('')
-                
-                for img in images_by_page[current_page]:
-                    alt_text = f"Image {img['index']} from page {img['page']}"
-                    result_lines.append(f"![{alt_text}]({img['url']})")
-                    result_lines.append('')
-                
+            if line.startswith(('## Page ', '# Page ')):
+                page_match = _PAGE_HEADER_RE.search(line)
+                if page_match:
+                    current_page = int(page_match.group(1))
+            
+            is_blank = not line.strip()
+            if is_blank and not prev_blank and current_page in image_blocks:
+                pieces.append('\n'.join(lines[start:i + 1]))
                 # 标记该页面的图片已处理
-                del images_by_page[current_page]
+                pieces.append(image_blocks.pop(current_page))
+                start = i + 1
+            prev_blank = is_blank
+        
+        if start < len(lines):
+            pieces.append('\n'.join(lines[start:]))
         
         # 处理剩余未处理的图片
-        for page, imgs in images_by_page.items():
-            result_lines.append('')
-            result_lines.append(f'### Images from Page {page}')
-            result_lines.append('')
-            
-            for img in imgs:
-                alt_text = f"Image {img['index']} from page {img['page']}"
-                result_lines.append(f"![{alt_text}]({img['url']})")
-                result_lines.append('')
+        pieces.extend(image_blocks.values())
         
-        return '\n'.join(result_lines)
+        return '\n'.join(pieces)
+    
+    def _render_page_images(self, page: int, imgs: List[Dict[str, Any]]) -> str:
+        """渲染单页的图片引用块（以空行开头，每张图片后跟空行）"""
+        block_lines = ['', f'### Images from Page {page}', '']
+        for img in imgs:
+            alt_text = f"Image {img['index']} from page {img['page']}"
+            block_lines.append(f"![{alt_text}]({img['url']})")
+            block_lines.append('')
+        return '\n'.join(block_lines)
     
     async def _paginate_content(self, content: str, pdf_info: Dict[str, Any]) -> List[Dict[str, Any]]:
         """将内容分页"""
         pages = []
         
         # 按页面分隔符分割内容
-        page_pattern = r'^##?\s*Page\s+(\d+)'
         lines = content.split('\n')
         
         current_page_content = []
         current_page_num = 1
         
         for line in lines:
-            page_match = re.match(page_pattern, line.strip())
+            page_match = _PAGE_PATTERN.match(line.strip())
             
             if page_match:
                 # 保存当前页面
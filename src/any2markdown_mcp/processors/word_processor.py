@@ -10,34 +10,125 @@ Word文档处理器
 """
 
 import asyncio
-import tempfile
+import multiprocessing
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 import re
 import zipfile
-import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 import structlog
+from lxml import etree
 from docx import Document
-from docx.shared import Inches
-from docx.oxml.ns import nsdecls, qn
-from PIL import Image
-import io
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.parser import element_class_lookup, parse_xml
+from docx.styles import BabelFish
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
 
 from .base_processor import BaseProcessor
 
 logger = structlog.get_logger(__name__)
 
+# 表格单元格文本清洗：换行转空格、转义管道符，单次扫描完成
+_CELL_TRANS = str.maketrans({"\n": " ", "|": "\\|"})
+
+# Word文档中的页眉页脚通常包含特定的格式模式；整段内容一次替换删除匹配的行
+# （行内空白用[^\S\n]，避免匹配跨越换行）
+_WORD_HEADER_FOOTER_LINE_RE = re.compile(
+    r"^.*(?:"
+    r"第[^\S\n]*\d+[^\S\n]*页.*共[^\S\n]*\d+[^\S\n]*页"  # 中文页码格式
+    r"|Page[^\S\n]+\d+[^\S\n]+of[^\S\n]+\d+"  # 英文页码格式
+    r"|\d+[^\S\n]*/[^\S\n]*\d+"  # 简单页码格式
+    r"|\d{4}年\d{1,2}月\d{1,2}日"  # 中文日期格式
+    r"|\d{1,2}/\d{1,2}/\d{4}"  # 英文日期格式
+    r").*(?:\n|\Z)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# 快速解析路径使用的元素标签名与读取块大小
+_W_BODY = qn('w:body')
+_W_P = qn('w:p')
+_W_TBL = qn('w:tbl')
+_W_T = qn('w:t')
+_XML_CHUNK_SIZE = 64 * 1024
+
+# 可提取的图片扩展名
+_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff')
+
+# 段落样式名 -> (前缀, 后缀)，None 表示按普通段落处理内联格式；按需填充
+_STYLE_TO_MARKDOWN: Dict[str, Optional[Tuple[str, str]]] = {}
+
+
+def _style_markdown(style_name: str) -> Optional[Tuple[str, str]]:
+    """获取段落样式对应的Markdown包裹方式，每个样式名只解析一次"""
+    try:
+        return _STYLE_TO_MARKDOWN[style_name]
+    except KeyError:
+        pass
+    
+    # 标题样式
+    if "Heading" in style_name:
+        level = 1
+        for candidate in range(1, 7):
+            if f"Heading {candidate}" in style_name:
+                level = candidate
+                break
+        markdown = (f"{'#' * level} ", "")
+    # 列表项
+    elif "List" in style_name:
+        markdown = ("- ", "")
+    # 引用
+    elif "Quote" in style_name:
+        markdown = ("> ", "")
+    # 代码
+    elif "Code" in style_name:
+        markdown = ("```\n", "\n```")
+    # 普通段落
+    else:
+        markdown = None
+    
+    _STYLE_TO_MARKDOWN[style_name] = markdown
+    return markdown
+
+
+# 解析子进程内复用的处理器实例
+_worker_processor: Optional["WordProcessor"] = None
+
+
+def _init_word_worker(config: Dict[str, Any]) -> None:
+    """解析子进程初始化：创建一次处理器实例"""
+    global _worker_processor
+    _worker_processor = WordProcessor(config)
+
+
+def _parse_document_worker(word_path: str, options: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    """在子进程中解析并转换Word文档"""
+    return _worker_processor._parse_document_sync(Path(word_path), options)
+
 
 class WordProcessor(BaseProcessor):
     """Word文档处理器"""
     
+    # 按内容哈希缓存的转换结果，所有实例共享
+    _CONVERSION_CACHE_MAXSIZE = 64
+    _conversion_cache: "OrderedDict[str, Tuple[Dict[str, Any], List[Dict[str, Any]], str]]" = OrderedDict()
+    
+    # 文档解析进程池（word_workers > 0 时启用，所有实例共享）
+    _parse_pool: Optional[ProcessPoolExecutor] = None
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         
         # Word特定配置
         self.preserve_formatting = self._get_config_value("word_preserve_formatting", True)
         self.convert_equations = self._get_config_value("word_convert_equations", True)
+        self.enable_cache = self._get_config_value("enable_cache", True)
+        self.fast_parse = self._get_config_value("word_fast_parse", False)
+        self.workers = int(self._get_config_value("word_workers", 0) or 0)
         
         logger.info("WordProcessor initialized")
     
@@ -56,44 +147,22 @@ class WordProcessor(BaseProcessor):
         Returns:
             转换结果
         """
-        temp_files = []
-        
         try:
             # 验证文件大小
             self.validate_file_size(file_content)
             
-            # 保存临时Word文件
-            temp_word_path = await self.save_temp_file(file_content, suffix=".docx")
-            temp_files.append(str(temp_word_path))
-            
-            logger.info("Starting Word conversion", 
-                       file_size=len(file_content),
-                       temp_path=str(temp_word_path))
-            
-            # 打开Word文档
-            doc = Document(str(temp_word_path))
-            
-            # 分析文档结构
-            doc_info = await self._analyze_document_structure(doc)
-            
-            # 提取图片（如果启用）
-            images_info = []
-            if options.get("extract_images", True):
-                images_info = await self._extract_images(temp_word_path)
-                # 注意：不要将图片文件添加到temp_files中，因为它们需要被保留用于静态文件服务
-            
-            # 转换文档内容
-            markdown_content = await self._convert_document_content(doc, options)
-            
-            # 移除页眉页脚（如果启用）
-            if options.get("remove_header_footer", True):
-                markdown_content = await self._remove_header_footer(
-                    markdown_content, doc_info, options
+            # 相同内容重复提交时直接复用缓存的转换结果
+            cache_key = self._make_cache_key(file_content, options) if self.enable_cache else None
+            cached = self._get_cached_conversion(cache_key) if cache_key else None
+            if cached:
+                logger.info("Word conversion cache hit", file_size=len(file_content))
+                doc_info, images_info, markdown_content = cached
+            else:
+                doc_info, images_info, markdown_content = await self._convert_content(
+                    file_content, options
                 )
-            
-            # 嵌入图片URL到markdown中
-            if images_info:
-                markdown_content = await self._embed_image_urls(markdown_content, images_info)
+                if cache_key:
+                    self._store_cached_conversion(cache_key, doc_info, images_info, markdown_content)
             
             # 分页处理（如果启用）
             if options.get("paginate_output", True):
@@ -128,12 +197,132 @@ class WordProcessor(BaseProcessor):
         except Exception as e:
             logger.error("Word conversion failed", error=str(e))
             raise
+    
+    async def _convert_content(self, file_content: bytes, options: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]], str]:
+        """解析文档、提取图片并转换内容，返回(doc_info, images_info, markdown_content)"""
+        temp_files = []
+        
+        try:
+            # 保存临时Word文件
+            temp_word_path = await self.save_temp_file(file_content, suffix=".docx")
+            temp_files.append(str(temp_word_path))
+            
+            logger.info("Starting Word conversion", 
+                       file_size=len(file_content),
+                       temp_path=str(temp_word_path))
+            
+            # 解析并转换文档（在子进程或线程中执行，避免阻塞事件循环）
+            if self.workers > 0:
+                doc_info, markdown_content = await self._parse_in_pool(temp_word_path, options)
+            else:
+                doc_info, markdown_content = await asyncio.to_thread(
+                    self._parse_document_sync, temp_word_path, options
+                )
+            
+            # 提取图片（如果启用）
+            images_info = []
+            if options.get("extract_images", True):
+                images_info = await self._extract_images(temp_word_path)
+                # 注意：不要将图片文件添加到temp_files中，因为它们需要被保留用于静态文件服务
+            
+            # 是否含图片优先使用提取结果；未提取或提取失败时只读取ZIP中央目录确认
+            doc_info["has_images"] = bool(images_info) or self._has_media_entries(temp_word_path)
+            
+            # 移除页眉页脚（如果启用）
+            if options.get("remove_header_footer", True):
+                markdown_content = await self._remove_header_footer(
+                    markdown_content, doc_info, options
+                )
+            
+            # 嵌入图片URL到markdown中
+            if images_info:
+                markdown_content = await self._embed_image_urls(markdown_content, images_info)
+            
+            return doc_info, images_info, markdown_content
+            
         finally:
             # 清理临时文件
             if temp_files:
                 await self.cleanup_temp_files(temp_files)
     
-    async def _analyze_document_structure(self, doc: Document) -> Dict[str, Any]:
+    def _make_cache_key(self, file_content: bytes, options: Dict[str, Any]) -> str:
+        """根据文件内容哈希和影响转换结果的选项生成缓存键"""
+        return "|".join((
+            self.content_digest(file_content),
+            str(bool(options.get("extract_images", True))),
+            str(bool(options.get("remove_header_footer", True))),
+            str(bool(options.get("preserve_formatting", True))),
+        ))
+    
+    def _get_cached_conversion(self, cache_key: str) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], str]]:
+        """读取缓存的转换结果，返回副本以免调用方修改缓存"""
+        cached = self._conversion_cache.get(cache_key)
+        if cached is None:
+            return None
+        
+        doc_info, images_info, markdown_content = cached
+        
+        # 图片文件可能已被定期清理，此时缓存失效
+        if any(not Path(img["path"]).exists() for img in images_info):
+            self._conversion_cache.pop(cache_key, None)
+            return None
+        
+        self._conversion_cache.move_to_end(cache_key)
+        return doc_info, [dict(img) for img in images_info], markdown_content
+    
+    def _store_cached_conversion(self, cache_key: str, doc_info: Dict[str, Any],
+                                 images_info: List[Dict[str, Any]],
+                                 markdown_content: str) -> None:
+        """写入转换结果缓存，超出容量时淘汰最久未使用的条目"""
+        self._conversion_cache[cache_key] = (
+            doc_info,
+            [dict(img) for img in images_info],
+            markdown_content,
+        )
+        self._conversion_cache.move_to_end(cache_key)
+        while len(self._conversion_cache) > self._CONVERSION_CACHE_MAXSIZE:
+            self._conversion_cache.popitem(last=False)
+    
+    @classmethod
+    def _get_parse_pool(cls, workers: int, config: Dict[str, Any]) -> ProcessPoolExecutor:
+        """获取文档解析进程池（使用spawn，避免在多线程的服务进程中fork）"""
+        if cls._parse_pool is None:
+            cls._parse_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_word_worker,
+                initargs=(config,)
+            )
+            logger.info("Word parse process pool created", workers=workers)
+        return cls._parse_pool
+    
+    async def _parse_in_pool(self, word_path: Path, options: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """在独立进程中解析并转换文档，多个文档可以利用多核并行处理"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._get_parse_pool(self.workers, self.config),
+                _parse_document_worker, str(word_path), options
+            )
+        except BrokenProcessPool:
+            # 子进程异常退出后进程池不可再用，下次调用时重建
+            WordProcessor._parse_pool = None
+            raise
+    
+    def _parse_document_sync(self, word_path: Path, options: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """解析并转换Word文档，返回(doc_info, markdown_content)（同步，在线程或子进程中调用）"""
+        if self.fast_parse:
+            # 直接流式解析document.xml，跳过python-docx对象模型
+            return self._fast_convert_sync(word_path, options)
+        
+        doc = Document(str(word_path))
+        doc_info = self._analyze_document_structure(doc)
+        markdown_content = self._convert_document_content(
+            doc, options, doc_info["properties"].get("title")
+        )
+        return doc_info, markdown_content
+    
+    def _analyze_document_structure(self, doc: Document) -> Dict[str, Any]:
         """分析Word文档结构"""
         try:
             info = {
@@ -146,25 +335,23 @@ class WordProcessor(BaseProcessor):
                 "properties": {}
             }
             
-            # 文档属性
-            if hasattr(doc.core_properties, 'title') and doc.core_properties.title:
-                info["properties"]["title"] = doc.core_properties.title
-            if hasattr(doc.core_properties, 'author') and doc.core_properties.author:
-                info["properties"]["author"] = doc.core_properties.author
-            if hasattr(doc.core_properties, 'created') and doc.core_properties.created:
-                info["properties"]["created"] = str(doc.core_properties.created)
+            # 文档属性（core_properties每次访问都会重新解析属性部件，只取一次）
+            core_properties = doc.core_properties
+            title = getattr(core_properties, 'title', None)
+            author = getattr(core_properties, 'author', None)
+            created = getattr(core_properties, 'created', None)
+            if title:
+                info["properties"]["title"] = title
+            if author:
+                info["properties"]["author"] = author
+            if created:
+                info["properties"]["created"] = str(created)
             
             # 检查样式使用情况
             for paragraph in doc.paragraphs:
                 if paragraph.style and paragraph.style.name:
                     info["styles_used"].add(paragraph.style.name)
             
-            # 检查是否有图片
-            for rel in doc.part.rels.values():
-                if "image" in rel.target_ref:
-                    info["has_images"] = True
-                    break
-            
             # 检查页眉页脚
             for section in doc.sections:
                 if (section.header.paragraphs and 
@@ -190,44 +377,53 @@ class WordProcessor(BaseProcessor):
         images_info = []
         
         try:
-            # Word文档实际上是一个ZIP文件
-            with zipfile.ZipFile(str(word_path), 'r') as docx_zip:
-                # 查找图片文件
-                image_files = [f for f in docx_zip.namelist() 
-                             if f.startswith('word/media/') and 
-                             any(f.lower().endswith(ext) for ext in 
-                                 ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff'])]
+            # 解压图片在线程中执行，避免阻塞事件循环
+            image_entries = await asyncio.to_thread(self._read_image_entries, word_path)
+            
+            # 先确定文件名，再并发保存所有图片；内容相同的图片（如重复的logo）只保存一次
+            jobs = []
+            entries = []
+            saved_by_digest: Dict[str, int] = {}
+            for img_index, img_path, img_data in image_entries:
+                # 获取原始文件名和扩展名
+                original_filename = img_path.rpartition("/")[2]
                 
-                for img_index, img_path in enumerate(image_files):
-                    try:
-                        # 读取图片数据
-                        img_data = docx_zip.read(img_path)
-                        
-                        # 获取原始文件名和扩展名
-                        original_filename = Path(img_path).name
-                        
-                        # 保存图片（使用实例ID避免文件名冲突）
-                        filename = f"word_{self.instance_id}_img_{img_index + 1}_{original_filename}"
-                        image_info = await self.save_image(img_data, filename)
-                        
-                        # 添加额外信息
-                        image_info.update({
-                            "index": img_index + 1,
-                            "original_path": img_path,
-                            "original_filename": original_filename
-                        })
-                        
-                        images_info.append(image_info)
-                        
-                        logger.debug("Image extracted from Word", 
-                                   index=img_index + 1,
-                                   filename=filename)
-                        
-                    except Exception as e:
-                        logger.warning("Failed to extract image from Word", 
-                                     path=img_path,
-                                     error=str(e))
-                        continue
+                digest = self.content_digest(img_data)
+                job_index = saved_by_digest.get(digest)
+                if job_index is None:
+                    job_index = saved_by_digest[digest] = len(jobs)
+                    # 保存图片（使用实例ID避免文件名冲突）
+                    filename = f"word_{self.instance_id}_img_{img_index + 1}_{original_filename}"
+                    jobs.append((filename, img_data))
+                
+                entries.append((img_index, img_path, original_filename, job_index))
+            
+            results = await asyncio.gather(
+                *[self.save_image(img_data, filename) for filename, img_data in jobs],
+                return_exceptions=True
+            )
+            
+            for img_index, img_path, original_filename, job_index in entries:
+                saved = results[job_index]
+                if isinstance(saved, Exception):
+                    logger.warning("Failed to extract image from Word", 
+                                 path=img_path,
+                                 error=str(saved))
+                    continue
+                
+                # 重复图片共用已保存文件的路径和URL，仅序号和来源信息不同
+                image_info = dict(saved)
+                image_info.update({
+                    "index": img_index + 1,
+                    "original_path": img_path,
+                    "original_filename": original_filename
+                })
+                
+                images_info.append(image_info)
+                
+                logger.debug("Image extracted from Word", 
+                           index=img_index + 1,
+                           filename=image_info["filename"])
             
             logger.info("Image extraction from Word completed", count=len(images_info))
             return images_info
@@ -236,32 +432,63 @@ class WordProcessor(BaseProcessor):
             logger.error("Failed to extract images from Word document", error=str(e))
             return []
     
-    async def _convert_document_content(self, doc: Document, options: Dict[str, Any]) -> str:
-        """转换Word文档内容为Markdown"""
+    def _has_media_entries(self, word_path: Path) -> bool:
+        """只读取ZIP中央目录，检查是否包含图片条目（不解压任何内容）"""
+        try:
+            with zipfile.ZipFile(str(word_path), 'r') as docx_zip:
+                return any(name.startswith('word/media/') and name.lower().endswith(_IMAGE_EXTENSIONS)
+                           for name in docx_zip.namelist())
+        except Exception as e:
+            logger.warning("Failed to read Word zip directory", error=str(e))
+            return False
+    
+    def _read_image_entries(self, word_path: Path) -> List[Tuple[int, str, bytes]]:
+        """读取Word文档中的图片条目，返回(序号, ZIP内路径, 图片数据)列表（同步，在线程中调用）"""
+        entries = []
+        
+        # Word文档实际上是一个ZIP文件
+        with zipfile.ZipFile(str(word_path), 'r') as docx_zip:
+            # 查找图片文件（直接使用中央目录条目，无需再按名称查找）
+            image_entries = [zinfo for zinfo in docx_zip.infolist()
+                             if zinfo.filename.startswith('word/media/') and 
+                             zinfo.filename.lower().endswith(_IMAGE_EXTENSIONS)]
+            
+            for img_index, zinfo in enumerate(image_entries):
+                try:
+                    # 读取图片数据
+                    with docx_zip.open(zinfo) as img_file:
+                        entries.append((img_index, zinfo.filename, img_file.read()))
+                except Exception as e:
+                    logger.warning("Failed to extract image from Word", 
+                                 path=zinfo.filename,
+                                 error=str(e))
+        
+        return entries
+    
+    def _convert_document_content(self, doc: Document, options: Dict[str, Any],
+                                  title: Optional[str] = None) -> str:
+        """转换Word文档内容为Markdown（title 为结构分析时已读取的文档标题）"""
         try:
             markdown_lines = []
+            preserve_formatting = options.get("preserve_formatting", True)
             
             # 处理文档标题（如果有）
-            if hasattr(doc.core_properties, 'title') and doc.core_properties.title:
-                markdown_lines.append(f"# {doc.core_properties.title}")
+            if title:
+                markdown_lines.append(f"# {title}")
                 markdown_lines.append("")
             
-            # 处理段落和表格
-            for element in doc.element.body:
-                if element.tag.endswith('p'):  # 段落
-                    paragraph = self._find_paragraph_by_element(doc, element)
-                    if paragraph:
-                        markdown_line = await self._convert_paragraph(paragraph, options)
-                        if markdown_line:
-                            markdown_lines.append(markdown_line)
+            # 处理段落和表格：按正文顺序流式获取段落/表格对象
+            for item in doc.iter_inner_content():
+                if isinstance(item, Paragraph):  # 段落
+                    markdown_line = self._convert_paragraph(item, preserve_formatting)
+                    if markdown_line:
+                        markdown_lines.append(markdown_line)
                 
-                elif element.tag.endswith('tbl'):  # 表格
-                    table = self._find_table_by_element(doc, element)
-                    if table:
-                        table_markdown = await self._convert_table(table, options)
-                        if table_markdown:
-                            markdown_lines.extend(table_markdown)
-                            markdown_lines.append("")  # 表格后添加空行
+                elif isinstance(item, Table):  # 表格
+                    table_markdown = self._convert_table(item)
+                    if table_markdown:
+                        markdown_lines.extend(table_markdown)
+                        markdown_lines.append("")  # 表格后添加空行
             
             return "\n".join(markdown_lines)
             
@@ -269,74 +496,169 @@ class WordProcessor(BaseProcessor):
             logger.error("Failed to convert Word document content", error=str(e))
             raise
     
-    def _find_paragraph_by_element(self, doc: Document, element) -> Optional[object]:
-        """根据XML元素查找对应的段落对象"""
-        for paragraph in doc.paragraphs:
-            if paragraph._element == element:
-                return paragraph
-        return None
+    def _fast_convert_sync(self, word_path: Path, options: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """
+        直接解析docx包中的XML转换文档内容（同步，在线程中调用）
+        
+        不构建Document对象模型，以流式方式解析正文；元素仍使用python-docx注册的
+        元素类，段落文本和表格合并单元格的处理与常规路径一致。处理完的正文元素
+        立即释放，内存占用不随文档大小增长。
+        
+        Returns:
+            (doc_info, markdown_content)
+        """
+        with zipfile.ZipFile(str(word_path), 'r') as docx_zip:
+            names = set(docx_zip.namelist())
+            style_names, default_style = self._read_paragraph_styles(docx_zip, names)
+            properties = self._read_core_properties(docx_zip, names)
+            
+            info = {
+                "paragraph_count": 0,
+                "table_count": 0,
+                "section_count": 0,
+                "has_images": False,
+                "has_headers_footers": self._has_header_footer_text(docx_zip, names),
+                "styles_used": set(),
+                "properties": properties
+            }
+            
+            markdown_lines = []
+            preserve_formatting = options.get("preserve_formatting", True)
+            
+            # 处理文档标题（如果有）
+            if properties.get("title"):
+                markdown_lines.append(f"# {properties['title']}")
+                markdown_lines.append("")
+            
+            parser = etree.XMLPullParser(
+                events=("end",), tag=(_W_P, _W_TBL),
+                remove_blank_text=True, resolve_entities=False, huge_tree=True
+            )
+            parser.set_element_class_lookup(element_class_lookup)
+            
+            def handle_events() -> None:
+                for _, element in parser.read_events():
+                    parent = element.getparent()
+                    # 只处理正文的直接子元素，表格内的段落随表格一起处理
+                    if parent is None or parent.tag != _W_BODY:
+                        continue
+                    
+                    if element.tag == _W_P:  # 段落
+                        info["paragraph_count"] += 1
+                        if element.xpath("./w:pPr/w:sectPr"):
+                            info["section_count"] += 1
+                        style_name = style_names.get(element.style, default_style)
+                        info["styles_used"].add(style_name)
+                        markdown_line = self._convert_paragraph(
+                            Paragraph(element, None), preserve_formatting, style_name
+                        )
+                        if markdown_line:
+                            markdown_lines.append(markdown_line)
+                    
+                    else:  # 表格
+                        info["table_count"] += 1
+                        table_markdown = self._convert_table(Table(element, None))
+                        if table_markdown:
+                            markdown_lines.extend(table_markdown)
+                            markdown_lines.append("")  # 表格后添加空行
+                    
+                    # 释放已处理的元素
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del parent[0]
+            
+            with docx_zip.open("word/document.xml") as xml_file:
+                while chunk := xml_file.read(_XML_CHUNK_SIZE):
+                    parser.feed(chunk)
+                    handle_events()
+            root = parser.close()
+            handle_events()
+            
+            # 最后一节的节属性位于正文末尾
+            info["section_count"] += len(root.xpath("./w:body/w:sectPr"))
+        
+        info["styles_used"] = list(info["styles_used"])
+        
+        logger.debug("Word document structure analyzed", info=info)
+        return info, "\n".join(markdown_lines)
     
-    def _find_table_by_element(self, doc: Document, element) -> Optional[object]:
-        """根据XML元素查找对应的表格对象"""
-        for table in doc.tables:
-            if table._element == element:
-                return table
-        return None
+    def _read_paragraph_styles(self, docx_zip: zipfile.ZipFile, names: set) -> Tuple[Dict[str, str], str]:
+        """读取段落样式ID到样式名称的映射及默认段落样式名称"""
+        style_names: Dict[str, str] = {}
+        default_style = None
+        
+        if "word/styles.xml" in names:
+            styles = parse_xml(docx_zip.read("word/styles.xml"))
+            for style in styles.style_lst:
+                if style.type != WD_STYLE_TYPE.PARAGRAPH or style.name_val is None:
+                    continue
+                name = BabelFish.internal2ui(style.name_val)
+                # 与python-docx一致：相同ID取第一个，默认样式取最后一个
+                style_names.setdefault(style.styleId, name)
+                if style.default:
+                    default_style = name
+        
+        return style_names, default_style or "Normal"
     
-    async def _convert_paragraph(self, paragraph, options: Dict[str, Any]) -> str:
-        """转换段落为Markdown"""
-        if not paragraph.text.strip():
-            return ""
-        
+    def _read_core_properties(self, docx_zip: zipfile.ZipFile, names: set) -> Dict[str, Any]:
+        """读取文档核心属性（标题、作者、创建时间）"""
+        properties = {}
+        if "docProps/core.xml" not in names:
+            return properties
+        
+        core = parse_xml(docx_zip.read("docProps/core.xml"))
+        if core.title_text:
+            properties["title"] = core.title_text
+        if core.author_text:
+            properties["author"] = core.author_text
+        if core.created_datetime:
+            properties["created"] = str(core.created_datetime)
+        return properties
+    
+    def _has_header_footer_text(self, docx_zip: zipfile.ZipFile, names: set) -> bool:
+        """检查页眉页脚部件中是否有非空文本"""
+        for name in names:
+            if name.startswith(("word/header", "word/footer")) and name.endswith(".xml"):
+                part = etree.fromstring(docx_zip.read(name))
+                if any(t.text and t.text.strip() for t in part.iter(_W_T)):
+                    return True
+        return False
+    
+    def _convert_paragraph(self, paragraph, preserve_formatting: bool,
+                           style_name: Optional[str] = None) -> str:
+        """转换段落为Markdown（style_name 未提供时从段落样式获取）"""
         text = paragraph.text.strip()
+        if not text:
+            return ""
         
         # 根据样式转换
-        style_name = paragraph.style.name if paragraph.style else "Normal"
-        
-        # 标题样式
-        if "Heading" in style_name:
-            level = 1
-            if "Heading 1" in style_name:
-                level = 1
-            elif "Heading 2" in style_name:
-                level = 2
-            elif "Heading 3" in style_name:
-                level = 3
-            elif "Heading 4" in style_name:
-                level = 4
-            elif "Heading 5" in style_name:
-                level = 5
-            elif "Heading 6" in style_name:
-                level = 6
-            
-            return f"{'#' * level} {text}"
-        
-        # 列表项
-        elif "List" in style_name or paragraph.style.name in ["List Paragraph"]:
-            return f"- {text}"
-        
-        # 引用
-        elif "Quote" in style_name:
-            return f"> {text}"
-        
-        # 代码
-        elif "Code" in style_name:
-            return f"```\n{text}\n```"
-        
-        # 普通段落
-        else:
-            # 处理内联格式
-            formatted_text = await self._process_inline_formatting(paragraph, options)
-            return formatted_text
+        if style_name is None:
+            style = paragraph.style
+            style_name = style.name if style and style.name else "Normal"
+        
+        markdown = _style_markdown(style_name)
+        if markdown is not None:
+            prefix, suffix = markdown
+            return f"{prefix}{text}{suffix}"
+        
+        # 普通段落：处理内联格式
+        formatted_text = self._process_inline_formatting(paragraph, preserve_formatting)
+        return formatted_text
     
-    async def _process_inline_formatting(self, paragraph, options: Dict[str, Any]) -> str:
+    def _process_inline_formatting(self, paragraph, preserve_formatting: bool) -> str:
         """处理段落内的内联格式"""
-        if not options.get("preserve_formatting", True):
+        if not preserve_formatting:
             return paragraph.text
         
-        result = ""
+        runs = paragraph.runs
         
-        for run in paragraph.runs:
+        # 没有任何run带格式属性（最常见情况）时直接拼接文本
+        if not paragraph._p.xpath("./w:r/w:rPr"):
+            return "".join(run.text for run in runs)
+        
+        parts = []
+        
+        for run in runs:
             text = run.text
             
             # 应用格式
@@ -347,32 +669,57 @@ class WordProcessor(BaseProcessor):
             if run.underline:
                 text = f"<u>{text}</u>"
             
-            result += text
+            parts.append(text)
         
-        return result
+        return "".join(parts)
     
-    async def _convert_table(self, table, options: Dict[str, Any]) -> List[str]:
+    def _extract_table_rows(self, table) -> List[List[str]]:
+        """
+        直接遍历表格XML提取每行单元格文本
+        
+        不构造_Cell对象，语义与row.cells一致：横向合并的单元格按跨列数重复，
+        纵向合并的后续单元格取上一行同一网格位置的文本。
+        """
+        rows = []
+        above: Dict[int, str] = {}
+        
+        for tr in table._tbl.tr_lst:
+            cells = []
+            current: Dict[int, str] = {}
+            col = tr.grid_before
+            
+            for tc in tr.tc_lst:
+                span = tc.grid_span
+                if tc.vMerge == "continue":
+                    text = above.get(col, "")
+                else:
+                    text = "\n".join(p.text for p in tc.p_lst)
+                cells.extend([text] * span)
+                current[col] = text
+                col += span
+            
+            rows.append(cells)
+            above = current
+        
+        return rows
+    
+    def _convert_table(self, table) -> List[str]:
         """转换表格为Markdown"""
-        if not table.rows:
+        rows = self._extract_table_rows(table)
+        if not rows:
             return []
         
         markdown_lines = []
         
         # 处理表头
-        header_row = table.rows[0]
-        headers = []
-        for cell in header_row.cells:
-            headers.append(cell.text.strip() or " ")
+        headers = [text.strip() or " " for text in rows[0]]
         
         markdown_lines.append("| " + " | ".join(headers) + " |")
         markdown_lines.append("| " + " | ".join(["---"] * len(headers)) + " |")
         
         # 处理数据行
-        for row in table.rows[1:]:
-            cells = []
-            for cell in row.cells:
-                cell_text = cell.text.strip().replace("\n", " ").replace("|", "\\|")
-                cells.append(cell_text or " ")
+        for row in rows[1:]:
+            cells = [text.strip().translate(_CELL_TRANS) or " " for text in row]
             
             # 确保列数一致
             while len(cells) < len(headers):
@@ -399,33 +746,17 @@ class WordProcessor(BaseProcessor):
     
     async def _remove_word_specific_headers_footers(self, content: str, doc_info: Dict[str, Any]) -> str:
         """移除Word特定的页眉页脚"""
-        lines = content.split('\n')
-        cleaned_lines = []
-        
-        # Word文档中的页眉页脚通常包含特定的格式模式
-        word_header_footer_patterns = [
-            r'^.*第\s*\d+\s*页.*共\s*\d+\s*页.*$',  # 中文页码格式
-            r'^.*Page\s+\d+\s+of\s+\d+.*$',  # 英文页码格式
-            r'^.*\d+\s*/\s*\d+.*$',  # 简单页码格式
-            r'^.*\d{4}年\d{1,2}月\d{1,2}日.*$',  # 中文日期格式
-            r'^.*\d{1,2}/\d{1,2}/\d{4}.*$',  # 英文日期格式
-        ]
-        
-        for line in lines:
-            line_stripped = line.strip()
-            
-            # 检查是否匹配页眉页脚模式
-            is_header_footer = False
-            for pattern in word_header_footer_patterns:
-                if re.match(pattern, line_stripped, re.IGNORECASE):
-                    is_header_footer = True
-                    logger.debug("Removing Word header/footer", line=line_stripped)
-                    break
-            
-            if not is_header_footer:
-                cleaned_lines.append(line)
+        cleaned_content, removed = _WORD_HEADER_FOOTER_LINE_RE.subn("", content)
+        if not removed:
+            return content
         
-        return '\n'.join(cleaned_lines)
+        # 末行被删除时会残留上一行的换行符，去掉以与逐行拼接的结果一致
+        if (cleaned_content.endswith('\n') and
+                _WORD_HEADER_FOOTER_LINE_RE.match(content, content.rfind('\n') + 1)):
+            cleaned_content = cleaned_content[:-1]
+        
+        logger.debug("Removed Word header/footer lines", count=removed)
+        return cleaned_content
     
     async def _embed_image_urls(self, content: str, images_info: List[Dict[str, Any]]) -> str:
         """将图片URL嵌入到markdown内容中"""
@@ -453,39 +784,24 @@ class WordProcessor(BaseProcessor):
         """将内容分页（Word文档通常按段落或章节分页）"""
         pages = []
         
-        # 按标题分页
-        lines = content.split('\n')
-        current_page_content = []
+        # 按标题分页：直接定位以"# "开头的行并切片原文，不拆分为行列表
+        start = 0
         current_page_num = 1
         
-        for line in lines:
-            # 检测主要标题作为分页点
-            if line.startswith('# ') and current_page_content:
-                # 保存当前页面
-                pages.append({
-                    "page": current_page_num,
-                    "content": '\n'.join(current_page_content).strip()
-                })
-                
-                # 开始新页面
-                current_page_num += 1
-                current_page_content = [line]
-            else:
-                current_page_content.append(line)
-        
-        # 保存最后一页
-        if current_page_content:
+        while True:
+            boundary = content.find("\n# ", start)
+            end = boundary if boundary != -1 else len(content)
             pages.append({
                 "page": current_page_num,
-                "content": '\n'.join(current_page_content).strip()
-            })
-        
-        # 如果没有找到标题分隔符，将整个内容作为一页
-        if not pages:
-            pages.append({
-                "page": 1,
-                "content": content.strip()
+                "content": content[start:end].strip()
             })
+            
+            if boundary == -1:
+                break
+            
+            # 开始新页面（从标题行开始）
+            start = boundary + 1
+            current_page_num += 1
         
         logger.info("Word content paginated", total_pages=len(pages))
         return pages 
\ No newline at end of file
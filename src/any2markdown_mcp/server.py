@@ -8,6 +8,7 @@ Any2Markdown MCP Server (使用 FastMCP 高级API)
 from pathlib import Path
 from mcp.server.fastmcp import FastMCP
 from fastapi import Response, Request
+from fastapi.responses import FileResponse
 import mimetypes
 
 from .config import settings
@@ -58,10 +59,19 @@ def create_mcp_server() -> FastMCP:
         path_param = request.path_params.get("file_path", "")
         file_path = static_dir / path_param
         if file_path.is_file():
+            # 按修改时间和大小生成ETag，客户端缓存未过期时直接返回304
+            stat = file_path.stat()
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+            
+            # 流式发送文件内容，不整体读入内存
             mime_type, _ = mimetypes.guess_type(file_path)
-            return Response(
-                file_path.read_bytes(),
-                media_type=mime_type or "application/octet-stream"
+            return FileResponse(
+                file_path,
+                media_type=mime_type or "application/octet-stream",
+                headers={"ETag": etag},
+                stat_result=stat
             )
         logger.warning("请求的静态文件未找到", path=str(file_path))
         return Response(content="Not Found", status_code=404)
@@ -6,6 +6,12 @@
 
 from pydantic import Field
 
+from ..config import settings
+
+# 处理器配置在导入时序列化一次，所有工具调用共享同一份（只读）字典，
+# 避免每次请求都执行settings.model_dump()
+PROCESSOR_CONFIG = settings.model_dump()
+
 # 为所有工具中表示文件内容的参数定义一个可重用的Pydantic Field。
 # 这确保了API的一致性，并简化了工具函数的定义。
 file_content_field = Field(
@@ -14,4 +20,5 @@ file_content_field = Field(
     # 这些是OpenAPI/JSON Schema的元数据，可以被MCP客户端（如Inspector）用来提供更好的UI
     contentEncoding="base64",
     mediaType="application/octet-stream"  # 通用二进制流，具体工具可以覆盖
-) 
\ No newline at end of file
+)
+
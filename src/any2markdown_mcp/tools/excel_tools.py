@@ -1,15 +1,13 @@
 """
 Excel处理工具 (函数式实现)
 """
-import base64
 from typing import List, Optional, Literal
 
 import structlog
 from pydantic import Field
 
 from ..processors import ExcelProcessor
-from ..config import settings
-from .base_tool import file_content_field
+from .base_tool import PROCESSOR_CONFIG, file_content_field
 
 logger = structlog.get_logger(__name__)
 
@@ -18,6 +16,7 @@ async def convert_excel_to_markdown(
     filename: str = "document.xlsx",
     output_format: Literal["markdown", "html", "json"] = "markdown",
     sheet_names: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
     include_formulas: bool = False,
     paginate_output: bool = True,
     include_content: bool = False
@@ -30,6 +29,8 @@ async def convert_excel_to_markdown(
         filename: 原始文件名。
         output_format: 输出格式 (markdown/html/json)。
         sheet_names: 要转换的工作表名称列表，None表示转换所有工作表。
+        columns: 要转换的列名列表，None表示转换所有列。各工作表只保留其中存在的列，
+            不含任何所选列的工作表会注明未找到所选列。
         include_formulas: 是否包含公式。
         paginate_output: 是否分页输出。
         include_content: 是否在响应中包含markdown_content字段。
@@ -41,6 +42,7 @@ async def convert_excel_to_markdown(
     options = {
         "output_format": output_format,
         "sheets": sheet_names,
+        "columns": columns,
         "include_formulas": include_formulas,
         "paginate_output": paginate_output
     }
@@ -48,7 +50,7 @@ async def convert_excel_to_markdown(
     logger.info("开始执行Excel到Markdown的转换", filename=filename)
 
     try:
-        processor = ExcelProcessor(settings.model_dump())
+        processor = ExcelProcessor(PROCESSOR_CONFIG)
         decoded_content = processor.decode_base64_content(file_content)
         
         logger.info("文件内容已解码", file_size=len(decoded_content))
@@ -8,127 +8,11 @@ import structlog
 from pydantic import Field
 
 from ..processors import PDFProcessor
-from ..config import settings
-from .base_tool import file_content_field
+from .base_tool import PROCESSOR_CONFIG, file_content_field
 
 logger = structlog.get_logger(__name__)
 
 
-def _detect_language_from_text(text: str) -> List[str]:
-    """
-    自动检测文本语言
-    
-    Args:
-        text: 要检测的文本
-        
-    Returns:
-        检测到的语言代码列表
-    """
-    if not text or len(text.strip()) < 10:
-        # 文本太短，返回默认语言
-        return ["en"]
-    
-    try:
-        # 尝试使用langdetect库进行语言检测
-        try:
-            from langdetect import detect, detect_langs
-            detected = detect(text)
-            
-            # 映射langdetect的语言代码到OCR支持的语言代码
-            language_mapping = {
-                'zh-cn': 'zh',
-                'zh': 'zh', 
-                'en': 'en',
-                'ja': 'ja',
-                'ko': 'ko',
-                'fr': 'fr',
-                'de': 'de',
-                'es': 'es',
-                'it': 'it',
-                'pt': 'pt',
-                'ru': 'ru',
-                'ar': 'ar',
-                'hi': 'hi',
-                'th': 'th',
-                'vi': 'vi'
-            }
-            
-            mapped_lang = language_mapping.get(detected, 'en')
-            logger.info("语言检测成功", detected_language=detected, mapped_language=mapped_lang)
-            return [mapped_lang]
-            
-        except ImportError:
-            # 如果langdetect不可用，尝试使用简单的字符检测
-            logger.warning("langdetect库不可用，使用简单字符检测")
-            return _simple_language_detection(text)
-            
-    except Exception as e:
-        logger.warning("语言检测失败，使用默认语言", error=str(e))
-        return ["en"]
-
-
-def _simple_language_detection(text: str) -> List[str]:
-    """
-    基于字符的简单语言检测
-    
-    Args:
-        text: 要检测的文本
-        
-    Returns:
-        检测到的语言代码列表
-    """
-    # 统计不同语言字符的出现次数
-    char_counts = {
-        'zh': 0,  # 中文
-        'ja': 0,  # 日文
-        'ko': 0,  # 韩文
-        'ar': 0,  # 阿拉伯文
-        'ru': 0,  # 俄文
-        'en': 0   # 英文/拉丁文
-    }
-    
-    for char in text[:1000]:  # 只检查前1000个字符
-        code_point = ord(char)
-        
-        # 中文字符范围
-        if (0x4E00 <= code_point <= 0x9FFF or  # CJK统一汉字
-            0x3400 <= code_point <= 0x4DBF):   # CJK扩展A
-            char_counts['zh'] += 1
-            
-        # 日文字符范围
-        elif (0x3040 <= code_point <= 0x309F or  # 平假名
-              0x30A0 <= code_point <= 0x30FF):   # 片假名
-            char_counts['ja'] += 1
-            
-        # 韩文字符范围
-        elif (0xAC00 <= code_point <= 0xD7AF or  # 韩文音节
-              0x1100 <= code_point <= 0x11FF):   # 韩文字母
-            char_counts['ko'] += 1
-            
-        # 阿拉伯文字符范围
-        elif (0x0600 <= code_point <= 0x06FF or  # 基本阿拉伯文
-              0x0750 <= code_point <= 0x077F):   # 阿拉伯文补充
-            char_counts['ar'] += 1
-            
-        # 西里尔字符范围（俄文等）
-        elif (0x0400 <= code_point <= 0x04FF):
-            char_counts['ru'] += 1
-            
-        # 拉丁字符范围（英文等）
-        elif (0x0000 <= code_point <= 0x007F or  # 基本拉丁文
-              0x0080 <= code_point <= 0x00FF):   # 拉丁文补充
-            char_counts['en'] += 1
-    
-    # 找出字符数最多的语言
-    max_lang = max(char_counts.items(), key=lambda x: x[1])
-    
-    if max_lang[1] > 0:
-        logger.info("简单语言检测完成", detected_language=max_lang[0], char_count=max_lang[1])
-        return [max_lang[0]]
-    else:
-        return ["en"]  # 默认英文
-
-
 async def convert_pdf_to_markdown(
     file_content: str = file_content_field,
     filename: str = "document.pdf",
@@ -164,38 +48,9 @@ async def convert_pdf_to_markdown(
     logger.info("开始执行PDF到Markdown的转换", filename=filename)
 
     try:
-        processor = PDFProcessor(settings.model_dump())
+        processor = PDFProcessor(PROCESSOR_CONFIG)
         decoded_content = processor.decode_base64_content(file_content)
         
-        # 如果没有指定语言，进行自动语言检测
-        if languages is None:
-            # 先快速提取一些文本进行语言检测
-            try:
-                import pymupdf
-                temp_pdf_path = await processor.save_temp_file(decoded_content, suffix=".pdf")
-                doc = pymupdf.open(str(temp_pdf_path))
-                
-                # 提取前几页的文本进行语言检测
-                sample_text = ""
-                for page_num in range(min(3, len(doc))):  # 最多检查前3页
-                    page = doc[page_num]
-                    page_text = page.get_text()
-                    sample_text += page_text[:500]  # 每页最多取500字符
-                    if len(sample_text) > 1000:  # 总共最多1000字符用于检测
-                        break
-                
-                doc.close()
-                await processor.cleanup_temp_files([str(temp_pdf_path)])
-                
-                # 自动检测语言
-                detected_languages = _detect_language_from_text(sample_text)
-                languages = detected_languages
-                logger.info("自动检测到的语言", languages=languages)
-                
-            except Exception as e:
-                logger.warning("语言自动检测失败，使用默认语言", error=str(e))
-                languages = ["en"]
-        
         # 构建选项字典
         options = {
             "output_format": output_format,
@@ -205,10 +60,13 @@ async def convert_pdf_to_markdown(
             "start_page": start_page,
             "end_page": end_page,
             "languages": languages,
-            "batch_multiplier": batch_multiplier
+            "batch_multiplier": batch_multiplier,
+            # 未指定语言时由处理器在分析文档结构时一并检测
+            "auto_detect_language": languages is None
         }
         
         result = await processor.convert(decoded_content, options)
+        languages = result.get("metadata", {}).get("detected_languages", languages)
 
         # 构建标准JSON响应
         response = {
@@ -260,7 +118,7 @@ async def analyze_pdf_structure(
     logger.info("开始执行PDF结构分析", filename=filename)
 
     try:
-        processor = PDFProcessor(settings.model_dump())
+        processor = PDFProcessor(PROCESSOR_CONFIG)
         decoded_content = processor.decode_base64_content(file_content)
         temp_pdf_path = await processor.save_temp_file(decoded_content, suffix=".pdf")
 
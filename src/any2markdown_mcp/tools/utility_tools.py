@@ -6,16 +6,14 @@ import asyncio
 import base64
 import json
 import time
-import platform
-import psutil
-from typing import Any, Dict, List, Literal
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 import structlog
 from pydantic import BaseModel, Field
 
 from ..processors import PDFProcessor, WordProcessor, ExcelProcessor
 from ..config import settings
-from .base_tool import file_content_field
+from .base_tool import PROCESSOR_CONFIG, file_content_field
 
 logger = structlog.get_logger(__name__)
 
@@ -50,21 +48,35 @@ async def batch_convert_documents(
 
     semaphore = asyncio.Semaphore(global_options.max_concurrent)
     tasks = [
-        _convert_single_document(semaphore, i, doc)
+        _convert_indexed_document(semaphore, i, doc)
         for i, doc in enumerate(documents)
     ]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
 
+    # 按完成顺序归档结果，失败的文档可立即记录；
+    # 响应需包含全部转换结果，所有结果仍保留到整批结束后一并返回
     successful = []
     failed = []
-    for i, res in enumerate(results):
-        if isinstance(res, Exception):
-            failed.append({"index": i, "filename": documents[i].filename, "error": str(res)})
+    for next_done in asyncio.as_completed(tasks):
+        i, res, error = await next_done
+        if error is not None:
+            failed.append({"index": i, "filename": documents[i].filename, "error": str(error)})
         else:
             successful.append({"index": i, "filename": documents[i].filename, "result": res})
     
+    # 按文档原始顺序返回
+    successful.sort(key=lambda item: item["index"])
+    failed.sort(key=lambda item: item["index"])
     return BatchConversionResult(successful_conversions=successful, failed_conversions=failed)
 
+async def _convert_indexed_document(
+    semaphore: asyncio.Semaphore, index: int, doc: DocumentToConvert
+) -> Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]:
+    """转换单个文档并附带其序号，异常作为结果返回以便按完成顺序归档"""
+    try:
+        return index, await _convert_single_document(semaphore, index, doc), None
+    except Exception as e:
+        return index, None, e
+
 async def _convert_single_document(
     semaphore: asyncio.Semaphore, index: int, doc: DocumentToConvert
 ) -> Dict[str, Any]:
@@ -80,8 +92,10 @@ async def _convert_single_document(
         if not processor_class:
             raise ValueError(f"Unsupported file type: {file_ext}")
 
-        processor = processor_class(settings.model_dump())
-        decoded_content = processor.decode_base64_content(doc.file_content)
+        processor = processor_class(PROCESSOR_CONFIG)
+        # 在线程中解码，避免大文件解码阻塞事件循环；解码后立即释放Base64字符串
+        decoded_content = await asyncio.to_thread(processor.decode_base64_content, doc.file_content)
+        doc.file_content = ""
         result = await processor.convert(decoded_content, doc.options)
         return result
 
@@ -89,10 +103,22 @@ async def get_system_status() -> dict:
     """
     获取系统状态，包括模型信息和资源使用情况。
     """
-    cpu_usage = psutil.cpu_percent(interval=1)
+    # 采集过程会读取/proc并可能调用外部命令，放到线程中执行以免阻塞事件循环
+    status = await asyncio.to_thread(_collect_system_status)
+    logger.info("获取系统状态", status=status)
+    return status
+
+def _collect_system_status() -> Dict[str, Any]:
+    """采集平台、CPU、内存和服务配置信息"""
+    # 仅状态查询需要，延迟导入以加快服务启动
+    import platform
+    import psutil
+    
+    # 每次独立短暂采样，不依赖与REST状态接口共享的interval=None基线（在工作线程中，不阻塞事件循环）
+    cpu_usage = psutil.cpu_percent(interval=0.1)
     memory_info = psutil.virtual_memory()
     
-    status = {
+    return {
         "timestamp": time.time(),
         "platform": {
             "system": platform.system(),
@@ -118,8 +144,6 @@ async def get_system_status() -> dict:
             "max_concurrent_jobs": settings.max_concurrent_jobs,
         },
     }
-    logger.info("获取系统状态", status=status)
-    return status
 
 async def validate_document(
     file_content: str = file_content_field,
@@ -153,7 +177,7 @@ async def validate_document(
         if not processor_class:
             raise ValueError(f"No validator available for file type: {file_ext}")
 
-        processor = processor_class(settings.model_dump())
+        # 验证只需确认存在对应的处理器，无需构造处理器实例
         
         # 构建基本文档元数据
         basic_metadata = {
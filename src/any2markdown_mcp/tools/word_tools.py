@@ -8,8 +8,7 @@ import structlog
 from pydantic import Field
 
 from ..processors import WordProcessor
-from ..config import settings
-from .base_tool import file_content_field
+from .base_tool import PROCESSOR_CONFIG, file_content_field
 
 logger = structlog.get_logger(__name__)
 
@@ -51,7 +50,7 @@ async def convert_word_to_markdown(
     logger.info("开始执行Word到Markdown的转换", filename=filename)
 
     try:
-        processor = WordProcessor(settings.model_dump())
+        processor = WordProcessor(PROCESSOR_CONFIG)
         decoded_content = processor.decode_base64_content(file_content)
         
         logger.info("文件内容已解码", file_size=len(decoded_content))
@@ -0,0 +1,69 @@
+"""
+Excel处理器单元测试
+"""
+
+import io
+
+import openpyxl
+import pytest
+
+from any2markdown_mcp.processors import ExcelProcessor
+
+
+def _make_workbook(sheets):
+    """按 {工作表名: 行列表} 构造xlsx文件内容"""
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for title, rows in sheets.items():
+        ws = wb.create_sheet(title)
+        for row in rows:
+            ws.append(row)
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def processor(tmp_path):
+    return ExcelProcessor({
+        "temp_image_dir": str(tmp_path / "images"),
+        "enable_cache": False,
+    })
+
+
+@pytest.mark.unit
+async def test_mixed_type_column_is_converted(processor):
+    """同一列中数值与文本混排时，工作表不应被丢弃"""
+    content = _make_workbook({
+        "Mixed": [["id", "value"], [1, 10], [2, "x"], [3, 2.5]],
+    })
+
+    result = await processor.convert(content, {"extract_images": False})
+
+    assert "## Mixed" in result["content"]
+    assert "| 1 | 10 |" in result["content"]
+    assert "| 2 | x |" in result["content"]
+    assert "| 3 | 2.5 |" in result["content"]
+
+
+@pytest.mark.unit
+async def test_column_selection_tolerates_missing_columns(processor):
+    """所选列只在部分工作表中存在时，其他工作表不应被丢弃"""
+    content = _make_workbook({
+        "People": [["id", "name", "age"], [1, "Alice", 30]],
+        "Orders": [["id", "amount"], [7, 99.5]],
+        "Notes": [["text"], ["hello"]],
+    })
+
+    result = await processor.convert(
+        content,
+        {"extract_images": False, "paginate_output": False, "columns": ["id", "name"]},
+    )
+
+    output = result["content"]
+    assert "| id | name |" in output
+    assert "| 1 | Alice |" in output
+    assert "| id |\n| --- |\n| 7 |" in output
+    assert "## Notes\n\n*None of the requested columns were found in this sheet.*" in output
+    assert "age" not in output
+    assert "amount" not in output